@@ -0,0 +1,30 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments
+from common import measure, report
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    cases = [
+        ("scalar", (64,), None),
+        ("per-channel N×C×H×W", (16, 3, 64, 64), (0, 2, 3)),
+        ("per-pixel N×C×H×W", (16, 3, 256, 256), 0),
+    ]
+    n_states = 64
+    for name, shape, axis in cases:
+        states = [BatchedMoments(axis=axis)(rng.random(shape)) for _ in range(n_states)]
+        compensated = [BatchedMoments(axis=axis, compensated=True)(rng.random(shape))] + states[1:]
+
+        def iadd(states=states):
+            bm = BatchedMoments.from_(states[0])
+            for state in states:
+                bm += state
+            return bm
+
+        def add(states=states):
+            return sum(states[1:], states[0])
+
+        report(f"+= of {n_states} {name} states", *measure(iadd))
+        report(f"+ of {n_states} {name} states", *measure(add))
+        report(f"+= of {n_states} {name} states (compensated)", *measure(iadd, compensated))
+        report(f"merge_all of {n_states} {name} states", *measure(BatchedMoments.merge_all, states))
@@ -0,0 +1,35 @@
+import time
+import tracemalloc
+
+# all results reported by the current process, collected by `suite.py`
+RESULTS: list = []
+# differences below the resolution of the measurements are never reported as regressions
+MIN_DIFFERENCE = {"seconds": 1e-3, "peak": 1 << 20}
+
+
+def measure(fn, *args, repeat: int = 3, **kwargs) -> tuple:
+    """Runs `fn(*args, **kwargs)` `repeat` times.
+
+    Returns: tuple of the best wall-clock time in seconds and the peak traced memory in bytes
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def report(name: str, seconds: float, peak: int, nbytes: int = None):
+    """Prints (and records) a single benchmark result line."""
+    RESULTS.append({"name": name, "seconds": seconds, "peak": peak})
+    line = f"{name:<48s} {seconds * 1e3:10.2f} ms {peak / 2**20:10.1f} MiB peak"
+    if nbytes is not None:
+        line += f" {peak / nbytes:6.2f}x input"
+    print(line)
@@ -0,0 +1,27 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments
+from common import measure, report
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    # a long stream of per-pixel float32 data with a large offset, which is hard for float32 accumulators
+    batches = [(1e3 + rng.standard_normal((16, 64, 64))).astype(np.float32) for _ in range(1024)]
+    reference = BatchedMoments(axis=0, dtype=np.float64)
+    for batch in batches:
+        reference(batch.astype(np.float64))
+    for dtype, compensated in ((np.float64, False), (np.float32, False), (np.float32, True)):
+        name = f"{np.dtype(dtype).name}{' compensated' if compensated else ''}"
+
+        def stream(dtype=dtype, compensated=compensated):
+            bm = BatchedMoments(axis=0, dtype=dtype, compensated=compensated)
+            for batch in batches:
+                bm(batch)
+            return bm
+
+        seconds, peak = measure(stream)
+        report(f"stream {name}", seconds, peak)
+        bm = stream()
+        for stat in ("mean", "std", "skewness", "kurtosis"):
+            error = np.abs(getattr(bm, stat) - getattr(reference, stat))
+            print(f"    max abs. error {stat:<10s} {error.max():.2e}")
@@ -0,0 +1,22 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments, GroupedBatchedMoments
+from common import measure, report
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    n_groups = 1000
+    data = rng.random((100_000, 16)).astype(np.float32)
+    ids = rng.integers(0, n_groups, size=len(data))
+
+    def dict_of_accumulators():
+        bms = {}
+        for g in np.unique(ids):
+            bms.setdefault(g, BatchedMoments(axis=0))(data[ids == g])
+        return bms
+
+    def grouped():
+        return GroupedBatchedMoments(n_groups, axis=0)(data, ids)
+
+    report(f"dict of {n_groups} BatchedMoments", *measure(dict_of_accumulators), data.nbytes)
+    report(f"GroupedBatchedMoments ({n_groups} groups)", *measure(grouped), data.nbytes)
@@ -0,0 +1,11 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments, HistogramMoments
+from common import measure, report
+
+if __name__ == '__main__':
+    data = np.random.default_rng(0).integers(0, 256, size=(256, 3, 256, 256), dtype=np.uint8)
+    for cls in (BatchedMoments, HistogramMoments):
+        bm = cls(axis=(0, 2, 3))(data)
+        seconds, peak = measure(bm.update, data)
+        report(f"update per-channel uint8 {cls.__name__}", seconds, peak, data.nbytes)
@@ -0,0 +1,26 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments
+from common import measure, report
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    n_states = 4096
+    data = (1e3 + rng.standard_normal((n_states, 16, 256))).astype(np.float32)
+    states = [BatchedMoments(axis=0, dtype=np.float32)(batch) for batch in data]
+    expected = BatchedMoments(axis=(0, 1))(data)
+
+    def sequential():
+        merged = BatchedMoments.from_(states[0])
+        for state in states:
+            merged += state
+        return merged
+
+    def merge_all():
+        return BatchedMoments.merge_all(states)
+
+    report(f"sequential += of {n_states} states", *measure(sequential))
+    report(f"merge_all of {n_states} states", *measure(merge_all))
+    for name, merged in (("sequential +=", sequential()), ("merge_all", merge_all())):
+        errors = [np.max(np.abs(getattr(merged, stat) - getattr(expected, stat))) for stat in ("mean", "variance")]
+        print(f"{name:<48s} max. error mean {errors[0]:.2e}, variance {errors[1]:.2e}")
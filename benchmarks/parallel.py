@@ -0,0 +1,34 @@
+import multiprocessing
+from multiprocessing import Pool
+
+import numpy as np
+
+from batchedmoments import BatchedMoments
+from common import measure, report
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    processes = multiprocessing.cpu_count()
+    for name, shape, axis in (("per-channel", (16, 3, 256, 256), (0, 2, 3)), ("per-pixel", (16, 3, 256, 256), 0)):
+        batches = [rng.random(shape).astype(np.float32) for _ in range(32)]
+
+        def sequential(batches=batches, axis=axis):
+            bm = BatchedMoments(axis=axis)
+            for batch in batches:
+                bm(batch)
+            return bm
+
+        def pool(batches=batches, axis=axis):
+            bm = BatchedMoments(axis=axis)(batches[0])
+            with Pool(processes=processes) as p:
+                for dbm in p.imap_unordered(BatchedMoments(axis=axis), batches[1:]):
+                    bm += dbm
+            return bm
+
+        def shared_memory(batches=batches, axis=axis):
+            return BatchedMoments(axis=axis).parallel_update(batches, processes=processes)
+
+        # the peak memory is traced in the main process only
+        report(f"sequential {name}", *measure(sequential))
+        report(f"Pool.imap_unordered {name} ({processes} processes)", *measure(pool))
+        report(f"parallel_update {name} ({processes} processes)", *measure(shared_memory))
@@ -0,0 +1,14 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments
+from common import measure, report
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    # per-sample moments of shape N×C×H×W, e.g. computed over a time axis
+    bm = BatchedMoments(axis=0)(rng.random((4, 64, 3, 256, 256)).astype(np.float32))
+    nbytes = bm._state.nbytes
+    for axis in ((0,), (0, 2, 3), (2, 3), None):
+        report(f"reduce {bm.shape} over {axis}", *measure(bm.reduce, axis), nbytes)
+    bm(np.zeros((1, 64, 3, 256, 256)), mask=rng.random((1, 64, 3, 256, 256)) < 0.1)
+    report(f"reduce {bm.shape} over (0, 2, 3) masked", *measure(bm.reduce, (0, 2, 3)), nbytes)
@@ -0,0 +1,45 @@
+import argparse
+import json
+import os
+import runpy
+import sys
+
+import common
+
+# all benchmarks, in the order they are run
+BENCHMARKS = ("update", "dtype", "threads", "combine", "merge_all", "reduce", "parallel", "grouped", "histogram")
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """Returns the names of the cases which are slower (or use more memory) than the baseline, beyond the tolerance."""
+    previous = {result["name"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        for key in ("seconds", "peak"):
+            if result[key] > (1.0 + tolerance) * before[key] and result[key] - before[key] > common.MIN_DIFFERENCE[key]:
+                regressions.append(f"{result['name']}: {key} {before[key]:.4g} -> {result[key]:.4g}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Runs the benchmarks and compares the results with a baseline.")
+    parser.add_argument("benchmarks", nargs="*", default=BENCHMARKS, help="benchmarks to run (default is all)")
+    parser.add_argument("--save", help="path of a json file the results are written to")
+    parser.add_argument("--compare", help="path of a json file with baseline results")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative slowdown reported as regression")
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        print(f"## {name}")
+        runpy.run_path(os.path.join(os.path.dirname(__file__), f"{name}.py"), run_name="__main__")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(common.RESULTS, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(common.RESULTS, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
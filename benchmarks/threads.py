@@ -0,0 +1,13 @@
+import os
+
+import numpy as np
+
+from batchedmoments import BatchedMoments
+from common import measure, report
+
+if __name__ == '__main__':
+    data = np.random.default_rng(0).random((64, 3, 256, 256)).astype(np.float32)
+    for n_threads in sorted({1, 2, 4, os.cpu_count()}):
+        bm = BatchedMoments(axis=(0, 2, 3), n_threads=n_threads)(data)
+        seconds, peak = measure(bm.update, data)
+        report(f"update per-channel n_threads={n_threads}", seconds, peak, data.nbytes)
@@ -0,0 +1,24 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments
+from common import measure, report
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    cases = [
+        ("scalar", (1 << 22,), None, np.float64),
+        ("per-channel N×C×H×W", (64, 3, 256, 256), (0, 2, 3), np.float32),
+        ("per-pixel N×C×H×W", (64, 3, 256, 256), 0, np.float32),
+        ("per-channel N×C×H×W", (64, 3, 256, 256), (0, 2, 3), np.uint8),
+        ("per-channel N×C×H×W", (1, 3, 256, 256), (0, 2, 3), np.float32),
+        ("per-channel N×C×H×W", (16, 3, 256, 256), (0, 2, 3), np.float32),
+        ("per-pixel N×C×H×W", (1, 3, 256, 256), 0, np.float32),
+        ("per-sample N×F", (4096, 256), 1, np.float64),
+    ]
+    for name, shape, axis, dtype in cases:
+        data = (rng.random(shape) * 255).astype(dtype)
+        for workspace in (False, True):
+            bm = BatchedMoments(axis=axis, workspace=workspace)(data)
+            seconds, peak = measure(bm.update, data)
+            label = " (workspace)" if workspace else ""
+            report(f"update {name} {shape[0]}× {np.dtype(dtype).name}{label}", seconds, peak, data.nbytes)
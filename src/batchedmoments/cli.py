@@ -0,0 +1,132 @@
+"""Computes the sample statistics of directories of `.npy` / `.npz` shards, e.g. normalization constants of data sets.
+
+Example:
+    batchedmoments "/data/train/**/*.npy" --axis 0 2 3 --output stats.json --checkpoint /tmp/train-stats
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Union
+import glob
+import json
+import os
+import sys
+import numpy as np
+
+from .moments import BatchedMoments
+
+# progress of a checkpoint: the name of the latest state and the shards merged into it
+_PROGRESS = "progress.json"
+
+
+def _scan(path: str, axis: Union[tuple, None], ddof: int, order: int, key: Union[str, None]) -> BatchedMoments:
+    """Computes the moments of a shard, `.npy` files are read in chunks, `.npz` files array by array."""
+    bm = BatchedMoments(axis, ddof=ddof, order=order)
+    if path.endswith(".npz"):
+        with np.load(path) as npz:
+            for name in [key] if key is not None else npz.files:
+                bm(npz[name])
+        return bm
+    return bm.update_memmap(np.load(path, mmap_mode="r"))
+
+
+def _shards(patterns: list) -> list:
+    """The sorted (and unique) absolute paths of the files matching the glob patterns."""
+    return sorted({
+        os.path.abspath(path) for pattern in patterns for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)
+    })
+
+
+def _load_checkpoint(directory: Path, options: dict) -> tuple:
+    """The merged moments and the merged shards of the checkpoint, or None and no shards if there is none."""
+    progress_path = directory / _PROGRESS
+    if not progress_path.exists():
+        return None, []
+    progress = json.loads(progress_path.read_text(encoding="utf-8"))
+    if progress["options"] != options:
+        raise RuntimeError(f"Checkpoint {directory} was created with different options {progress['options']}.")
+    return BatchedMoments.load(directory / progress["state"], mmap_mode=None), progress["shards"]
+
+
+def _save_checkpoint(directory: Path, options: dict, bm: BatchedMoments, shards: list):
+    """Saves the merged moments to a new file, which is referenced by the progress once it is written completely,
+    thus an interrupted checkpoint leaves the previous checkpoint intact."""
+    directory.mkdir(parents=True, exist_ok=True)
+    progress_path = directory / _PROGRESS
+    previous = json.loads(progress_path.read_text(encoding="utf-8"))["state"] if progress_path.exists() else None
+    state = f"state-{len(shards)}.bmom"
+    bm.save(directory / state)
+    progress = directory / (_PROGRESS + ".tmp")
+    progress.write_text(json.dumps({"options": options, "state": state, "shards": shards}), encoding="utf-8")
+    os.replace(progress, progress_path)
+    if previous is not None and previous != state:
+        (directory / previous).unlink()
+
+
+def _statistics(bm: BatchedMoments) -> dict:
+    """The tracked statistics of the moments, and the number of elements."""
+    orders = {"mean": 1, "std": 2, "variance": 2, "skewness": 3, "kurtosis": 4}
+    statistics = {"n": len(bm)}
+    for name, order in orders.items():
+        if order <= bm.order:
+            statistics[name] = np.asarray(getattr(bm, name))
+    return statistics
+
+
+def _write(statistics: dict, output: Union[str, None]):
+    """Writes the statistics as NPZ if the output ends with `.npz`, as JSON otherwise (to stdout if None)."""
+    if output is not None and output.endswith(".npz"):
+        np.savez(output, **statistics)
+        return
+    text = json.dumps({name: np.asarray(value).tolist() for name, value in statistics.items()}, indent=2)
+    if output is None:
+        print(text)
+        return
+    Path(output).write_text(text + "\n", encoding="utf-8")
+
+
+def _parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="batchedmoments", description=__doc__.splitlines()[0])
+    parser.add_argument("patterns", nargs="+", help="glob patterns of the .npy / .npz files, e.g. 'data/**/*.npy'")
+    parser.add_argument("--axis", type=int, nargs="*", default=None, help="axes to be reduced (default is all axes)")
+    parser.add_argument("--order", type=int, default=4, help="highest moment to be tracked (default is four)")
+    parser.add_argument("--ddof", type=int, default=0, help="delta degrees of freedom of the variance (default is zero)")
+    parser.add_argument("--key", default=None, help="name of the array in .npz files (default is all arrays)")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes (default is all CPUs)")
+    parser.add_argument("--output", default=None, help="output file, .json or .npz (default is JSON to stdout)")
+    parser.add_argument("--checkpoint", default=None, help="directory of the checkpoints, an existing checkpoint is resumed")
+    parser.add_argument("--checkpoint-every", type=int, default=64, help="number of shards merged between checkpoints")
+    return parser
+
+
+def main(argv: Union[list, None] = None) -> int:
+    args = _parser().parse_args(argv)
+    axis = tuple(args.axis) if args.axis else None
+    options = {"axis": list(axis) if axis is not None else None, "ddof": args.ddof, "order": args.order, "key": args.key}
+    checkpoint = Path(args.checkpoint) if args.checkpoint is not None else None
+    merged, merged_shards = _load_checkpoint(checkpoint, options) if checkpoint is not None else (None, [])
+    done = set(merged_shards)
+    shards = [path for path in _shards(args.patterns) if path not in done]
+    if merged is None and not shards:
+        print("No files match the patterns.", file=sys.stderr)
+        return 1
+    scan = partial(_scan, axis=axis, ddof=args.ddof, order=args.order, key=args.key)
+    processes = args.processes if args.processes is not None else os.cpu_count()
+    pool = ProcessPoolExecutor(processes) if processes > 1 and len(shards) > 1 else None
+    states = []
+    try:
+        # the shards are merged in order, thus the checkpoints list a prefix of the shards
+        for path, state in zip(shards, pool.map(scan, shards) if pool is not None else map(scan, shards)):
+            states.append(state)
+            merged_shards.append(path)
+            if len(states) >= args.checkpoint_every or len(merged_shards) == len(done) + len(shards):
+                merged = BatchedMoments.merge_all(([merged] if merged is not None else []) + states)
+                states = []
+                if checkpoint is not None:
+                    _save_checkpoint(checkpoint, options, merged, merged_shards)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    _write(_statistics(merged), args.output)
+    return 0
@@ -0,0 +1,132 @@
+# pylint: disable=unsubscriptable-object
+from typing import Union
+import copy
+import numpy as np
+
+from .moments import BatchedMoments
+
+
+class BatchedCovariance(BatchedMoments):
+    """Computes (batch-wise) sample statistics and the covariance between the features.
+
+    The elements of the moments (flattened in C order) are the features, thus with `F` features
+    the co-moment matrix `sum_{i=1}^n (x_i - mean)(x_i - mean)^T` of shape `(F, F)` is accumulated
+    alongside the moments of each feature.
+    The co-moment of a batch is computed with a single matrix product (which uses the threads of BLAS),
+    and merged exactly with the accumulated co-moment, like the moments.
+
+    Properties:
+        covariance  - returns the sample covariance matrix
+        correlation - returns the sample (Pearson) correlation matrix
+
+    """
+
+    def __init__(
+            self,
+            axis: Union[tuple, int] = None,
+            shape: tuple = None,
+            ddof: int = 0,
+            *,
+            order: int = 2,
+            dtype: np.dtype = np.float64
+    ):
+        """
+        Args:
+            axis: Axis to be reduced, the remaining axes enumerate the features.
+                    If None, a single feature is computed (default)
+            shape: Shape of the moments. If None, first update will initialize and set shape.
+            ddof: "Delta Degrees of Freedom": the divisor used in the calculation is
+                    ``N - ddof``, where ``N`` represents the number of elements. (default is zero)
+            order: Highest moment of each feature to be tracked, at least two. (default is two)
+            dtype: Floating point type of the moments and of the computations. (default is float64)
+        """
+        if order < 2:
+            raise ValueError(f"The covariance requires moments of order 2, got {order}.")
+        self._comoment: Union[np.ndarray, None] = None
+        super().__init__(axis, shape, ddof, order=order, dtype=dtype)
+
+    def _initialize(self, shape: Union[tuple, None]) -> bool:
+        super()._initialize(shape)
+        n_features = int(np.prod(self._moments_shape, dtype=int))
+        self._comoment = np.zeros((n_features, n_features), dtype=self._dtype)
+        return self._initialized
+
+    def _merge_comoment(self, n_b, mean_b: np.ndarray, comoment_b: np.ndarray):
+        """Merges the co-moment of `n_b` elements with mean `mean_b` into the co-moment of `self`,
+        must be called before the moments are merged."""
+        n = self._n + n_b
+        if n == 0:
+            return
+        delta = (mean_b - self._m1).reshape(-1)
+        self._comoment += comoment_b
+        self._comoment += np.multiply.outer(delta, delta * (self._n * n_b / n))
+
+    def update(
+            self,
+            t: np.ndarray,
+            weights: Union[np.ndarray, None] = None,
+            mask: Union[np.ndarray, None] = None
+    ) -> "BatchedCovariance":
+        if weights is not None or mask is not None:
+            raise RuntimeError("Weights or masks are not supported by the covariance.")
+        axis = self.axis if self.axis is not None else tuple(range(t.ndim))
+        # one row of features per sample, copies only if the reduced axes are not leading
+        x = np.moveaxis(t, axis, tuple(range(len(axis)))).reshape(-1, self._comoment.shape[0])
+        if x.shape[0] == 0:
+            return self
+        n_b, *moments_b = self._compute_moments(x, (0,), self._order, self._dtype)
+        moments_b = [m.reshape(self._moments_shape) for m in moments_b]
+        self._merge_comoment(n_b, moments_b[0], self._batch_comoment(x, moments_b[0]))
+        self._add_increments(self._merge_increments(self._n, self._moments, n_b, moments_b))
+        self._n += n_b
+        return self
+
+    def _batch_comoment(self, x: np.ndarray, mean: np.ndarray) -> np.ndarray:
+        """Computes the co-moment of the rows of `x` with a single matrix product."""
+        d = np.subtract(x, mean.reshape(-1), dtype=self._dtype)
+        return d.T @ d
+
+    def __iadd__(self, other: "BatchedCovariance") -> "BatchedCovariance":
+        """Add `other` instance to `self` and return modified `self`."""
+        if not isinstance(other, BatchedCovariance):
+            raise RuntimeError("Can't add moments without co-moment to a covariance.")
+        if not other._initialized:
+            raise RuntimeError("Object not initialized!")
+        if not self._initialized:
+            self._initialize(BatchedMoments._infer_data_shape(other.shape, other.axis))
+        if self.shape != other.shape:
+            raise RuntimeError("Won't broadcast shapes. You are on your own, sorry.")
+        # the checks of the moments come first, thus a failed addition leaves the co-moment untouched
+        if self.order > other.order:
+            raise RuntimeError(f"Can't add moments of order {other.order} to moments of order {self.order}.")
+        self._merge_comoment(other._n, other._m1, other._comoment)
+        return super().__iadd__(other)
+
+    def __add__(self, other: "BatchedCovariance") -> "BatchedCovariance":
+        """Return a new instance where `self` and `other` are added."""
+        added = copy.deepcopy(self)
+        added += other
+        return added
+
+    def __eq__(self, other):
+        if not isinstance(other, BatchedCovariance) or not super().__eq__(other):
+            return False
+        return np.allclose(self.covariance, other.covariance, equal_nan=True)
+
+    @property
+    def comoment(self) -> Union[np.ndarray, None]:
+        """The co-moment matrix of shape `(F, F)`."""
+        return self._comoment
+
+    @property
+    def covariance(self) -> Union[np.ndarray, None]:
+        if not self._initialized:
+            return None
+        return self._comoment / (self._n - self._ddof)
+
+    @property
+    def correlation(self) -> Union[np.ndarray, None]:
+        if not self._initialized:
+            return None
+        std = np.sqrt(np.diagonal(self._comoment))
+        return self._comoment / np.multiply.outer(std, std)
@@ -0,0 +1,213 @@
+# pylint: disable=unsubscriptable-object
+from typing import Union
+import numpy as np
+
+from .moments import BatchedMoments
+
+
+class GroupedBatchedMoments:
+    """Computes (batch-wise) sample statistics of many independent groups at once.
+
+    The first axis of the data enumerates the samples, each sample belongs to one group.
+    The moments of all groups are stored as stacked arrays of shape `(n_groups, *shape)`.
+
+    Properties:
+        mean        - returns the sample mean of each group
+        variance    - returns the sample variance of each group
+        std         - returns the sample standard deviation of each group
+        skewness    - returns the sample skewness of each group
+        kurtosis    - return the sample kurtosis of each group
+
+    """
+
+    def __init__(
+            self,
+            n_groups: int,
+            axis: Union[tuple, int] = None,
+            ddof: int = 0,
+            *,
+            order: int = 4,
+            dtype: np.dtype = np.float64
+    ):
+        """
+        Args:
+            n_groups: Number of groups, group ids must be in `[0, n_groups)`.
+            axis: Axis to be reduced, must contain the first (sample) axis.
+                    If None, a scalar value is computed for each group (default)
+            ddof: "Delta Degrees of Freedom": the divisor used in the calculation is
+                    ``N - ddof``, where ``N`` represents the number of elements. (default is zero)
+            order: Highest moment to be tracked. (default is four)
+            dtype: Floating point type of the moments and of the computations. (default is float64)
+        """
+        if order < 1:
+            raise ValueError(f"Order must be at least 1, got {order}.")
+        self.axis: Union[tuple, None] = None
+        if axis is not None:
+            self.axis = axis if isinstance(axis, tuple) else tuple([axis])
+            if 0 not in self.axis:
+                raise ValueError("The axis must contain the first (sample) axis.")
+        self._n_groups = n_groups
+        self._ddof = ddof
+        self._order = order
+        self._dtype = np.dtype(dtype)
+        self._n: np.ndarray = np.zeros(n_groups, dtype=np.int64)
+        self._moments: Union[tuple, None] = None
+        self._moments_shape: Union[tuple, None] = None
+        self._initialized: bool = False
+
+    def _initialize(self, shape: tuple):
+        """Initialize buffers with the given shape of the data."""
+        axis = self.axis if self.axis is not None else tuple(range(len(shape)))
+        self._n = np.zeros(self._n_groups, dtype=np.int64)
+        self._moments_shape = tuple(x for _i, x in enumerate(shape) if _i not in axis)
+        self._moments = tuple(
+            np.zeros((self._n_groups, *self._moments_shape), dtype=self._dtype)
+            for _ in range(self._order)
+        )
+        self._initialized = True
+
+    def _counts(self, n: np.ndarray) -> np.ndarray:
+        """Reshapes the counts of the groups, such that they broadcast with the moments."""
+        return n.reshape(n.shape + (1,) * len(self._moments_shape))
+
+    def _compute_moments(self, t: np.ndarray, group_ids: np.ndarray) -> tuple:
+        """Computes the moments of all groups present in the batch with segmented sums over the samples.
+
+        Returns: tuple of the present groups, their element counts and moments
+        """
+        axis = self.axis if self.axis is not None else tuple(range(t.ndim))
+        rest = tuple(ax for ax in axis if ax != 0)
+        groups, inverse, counts = np.unique(group_ids, return_inverse=True, return_counts=True)
+        # samples sorted by group, such that the sums over the samples of each group are contiguous
+        order = np.argsort(inverse.reshape(-1), kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        n = counts * int(np.prod([t.shape[ax] for ax in rest], dtype=int))
+
+        def segment_sum(x: np.ndarray) -> np.ndarray:
+            return np.add.reduceat((x.sum(axis=rest) if rest else x)[order], starts, axis=0)
+
+        n_b = self._counts(n.astype(np.float64))
+        m1 = (segment_sum(t.astype(self._dtype, copy=False)) / n_b).astype(self._dtype, copy=False)
+        moments = [m1]
+        if self._order > 1:
+            d = np.subtract(t, np.expand_dims(m1[inverse.reshape(-1)], rest), dtype=self._dtype)
+            power = np.multiply(d, d, out=d if self._order < 3 else None)
+            moments.append(segment_sum(power))
+            for _ in range(3, self._order + 1):
+                moments.append(segment_sum(np.multiply(power, d, out=power)))
+        return groups, n, tuple(moments)
+
+    def _merge(self, groups: np.ndarray, n_b: np.ndarray, moments_b: tuple):
+        """Merges the moments of the given groups into the moments of `self`."""
+        moments_a = tuple(m[groups] for m in self._moments)
+        increments = BatchedMoments._merge_increments(
+            self._counts(self._n[groups].astype(np.float64)),
+            moments_a,
+            self._counts(n_b.astype(np.float64)),
+            moments_b
+        )
+        for m, a, increment in zip(self._moments, moments_a, increments):
+            m[groups] = a + increment
+        self._n[groups] += n_b
+
+    def update(self, t: np.ndarray, group_ids: np.ndarray) -> "GroupedBatchedMoments":
+        group_ids = np.asarray(group_ids)
+        if group_ids.shape != t.shape[:1]:
+            raise RuntimeError("There must be exactly one group id per sample.")
+        if group_ids.size > 0 and (group_ids.min() < 0 or group_ids.max() >= self._n_groups):
+            raise RuntimeError(f"Group ids must be in [0, {self._n_groups}).")
+        if group_ids.size > 0:
+            self._merge(*self._compute_moments(t, group_ids))
+        return self
+
+    def __call__(self, x: np.ndarray, group_ids: np.ndarray) -> "GroupedBatchedMoments":
+        # convert to numpy if necessary
+        if not isinstance(x, np.ndarray):
+            x = np.array(x)
+        # check if initialized
+        if not self._initialized:
+            self._initialize(x.shape)
+        # perform update
+        return self.update(x, group_ids)
+
+    def __iadd__(self, other: "GroupedBatchedMoments") -> "GroupedBatchedMoments":
+        """Add the groups of `other` instance to `self` and return modified `self`."""
+        if not other._initialized:
+            raise RuntimeError("Object not initialized!")
+        if not self._initialized:
+            self._initialize(BatchedMoments._infer_data_shape(other.shape, other.axis))
+        if self.shape != other.shape or self.n_groups != other.n_groups:
+            raise RuntimeError("Won't broadcast shapes. You are on your own, sorry.")
+        if self.order > other.order:
+            raise RuntimeError(f"Can't add moments of order {other.order} to moments of order {self.order}.")
+        groups = np.flatnonzero(other._n)
+        self._merge(groups, other._n[groups], tuple(m[groups] for m in other._moments[:self._order]))
+        return self
+
+    def __getitem__(self, group: int) -> BatchedMoments:
+        """Export the moments of a single group as BatchedMoments instance."""
+        if not self._initialized:
+            raise RuntimeError("Object not initialized!")
+        bm = BatchedMoments(self.axis, self.shape, ddof=self._ddof, order=self._order, dtype=self._dtype)
+        bm._n = int(self._n[group])
+        bm._moments = tuple(m[group] for m in self._moments)
+        return bm
+
+    def __len__(self):
+        return self._n_groups
+
+    @property
+    def n_groups(self) -> int:
+        return self._n_groups
+
+    @property
+    def counts(self) -> np.ndarray:
+        """The number of elements seen by each group."""
+        return self._n
+
+    @property
+    def shape(self) -> tuple:
+        return self._moments_shape
+
+    @property
+    def order(self) -> int:
+        return self._order
+
+    def _check_order(self, order: int, statistic: str):
+        if self._order < order:
+            raise RuntimeError(f"The {statistic} requires moments of order {order}, but only order {self._order} is tracked.")
+
+    @property
+    def mean(self) -> Union[np.ndarray, None]:
+        return self._moments[0] if self._initialized else None
+
+    @property
+    def variance(self) -> Union[np.ndarray, None]:
+        self._check_order(2, "variance")
+        if not self._initialized:
+            return None
+        return self._moments[1] / self._counts(self._n - self._ddof)
+
+    @property
+    def std(self) -> Union[np.ndarray, None]:
+        variance = self.variance
+        return np.sqrt(variance) if variance is not None else None
+
+    @property
+    def skewness(self) -> Union[np.ndarray, None]:
+        """See `BatchedMoments.skewness`."""
+        self._check_order(3, "skewness")
+        if not self._initialized:
+            return None
+        return np.sqrt(1.0 * self._counts(self._n)) * self._moments[2] / pow(self._moments[1], 1.5)
+
+    @property
+    def kurtosis(self) -> Union[np.ndarray, None]:
+        """See `BatchedMoments.kurtosis`."""
+        self._check_order(4, "kurtosis")
+        if not self._initialized:
+            return None
+        return 1.0 * self._counts(self._n) * self._moments[3] / (self._moments[1] * self._moments[1]) - 3.0
+
+    def __repr__(self) -> str:
+        return f"<GroupedBatchedMoments ({self._n_groups} groups, {self._n.sum()})>"
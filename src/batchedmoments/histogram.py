@@ -0,0 +1,164 @@
+# pylint: disable=unsubscriptable-object
+from typing import Union
+import copy
+import numpy as np
+
+from .moments import BatchedMoments
+
+
+class HistogramMoments(BatchedMoments):
+    """Computes (batch-wise) sample statistics of small integer data (e.g. uint8 images) from value counts.
+
+    Instead of the moments, the number of occurrences of each value is accumulated (for each element of the moments).
+    The moments are derived exactly from the counts when they are read, and merging instances adds the counts.
+    Note that the counts need `2**bits` integers per element of the moments, thus they are best suited for
+    8 bit data or reduced shapes (e.g. per channel statistics).
+    """
+
+    # number of elements binned at once, bounds the size of the index temporaries
+    _CHUNK_SIZE = 1 << 20
+
+    def __init__(
+            self,
+            axis: Union[tuple, int] = None,
+            shape: tuple = None,
+            ddof: int = 0,
+            *,
+            order: int = 4,
+            dtype: np.dtype = np.float64,
+            value_dtype: np.dtype = np.uint8
+    ):
+        """
+        Args:
+            axis: Axis to be reduced. If None, a scalar value is computed (default)
+            shape: Shape of the moments. If None, first update will initialize and set shape.
+            ddof: "Delta Degrees of Freedom": the divisor used in the calculation is
+                    ``N - ddof``, where ``N`` represents the number of elements. (default is zero)
+            order: Highest moment to be tracked. (default is four)
+            dtype: Floating point type of the derived moments. (default is float64)
+            value_dtype: Integer type which covers the range of the data, at most 16 bits. (default is uint8)
+        """
+        value_info = np.iinfo(value_dtype)
+        if value_info.bits > 16:
+            raise ValueError(f"Value dtype must have at most 16 bits, got {np.dtype(value_dtype)}.")
+        self._value_dtype = np.dtype(value_dtype)
+        self._counts: Union[np.ndarray, None] = None
+        self._stale: bool = False
+        super().__init__(axis, shape, ddof, order=order, dtype=dtype)
+
+    @property
+    def _values(self) -> np.ndarray:
+        """All values of the value dtype, in order of the bins."""
+        value_info = np.iinfo(self._value_dtype)
+        return np.arange(value_info.min, value_info.max + 1)
+
+    def _initialize(self, shape: Union[tuple, None]) -> bool:
+        super()._initialize(shape)
+        self._counts = np.zeros(self._moments_shape + self._values.shape, dtype=np.int64)
+        self._stale = False
+        return self._initialized
+
+    @property
+    def _moments(self) -> tuple:
+        self._sync()
+        return BatchedMoments._moments.fget(self)
+
+    @_moments.setter
+    def _moments(self, moments: tuple):
+        BatchedMoments._moments.fset(self, moments)
+
+    def _sync(self):
+        """Derives the moments from the counts, if new values were counted since the last call."""
+        if not self._stale:
+            return
+        self._stale = False
+        if self._n == 0:
+            return
+        values = self._values.astype(np.float64)
+        m1 = self._counts @ values / self._n
+        moments = [m1]
+        delta = values - m1[..., None]
+        power = delta
+        for _ in range(1, self._order):
+            power = power * delta
+            moments.append(np.einsum("...v,...v->...", self._counts, power))
+        self._moments = tuple(np.asarray(m, dtype=self._dtype) for m in moments)
+
+    def update(self, t: np.ndarray, weights: np.ndarray = None, mask: np.ndarray = None) -> "HistogramMoments":
+        if weights is not None or mask is not None:
+            raise RuntimeError("Weights or masks can't be counted, use a BatchedMoments instance instead.")
+        if not np.issubdtype(t.dtype, np.integer) and t.dtype != np.bool_:
+            raise RuntimeError(f"Only integer data can be counted, got {t.dtype}.")
+        value_info = np.iinfo(self._value_dtype)
+        if (
+            not np.can_cast(t.dtype, self._value_dtype)
+            and t.size > 0
+            and (t.min() < value_info.min or t.max() > value_info.max)
+        ):
+            raise RuntimeError(f"Data exceeds the range of {self._value_dtype}.")
+        if t.ndim == 0:
+            t = t.reshape(1)
+        axis = self.axis if self.axis is not None else tuple(range(t.ndim))
+        kept = tuple(ax for ax in range(t.ndim) if ax not in axis)
+        # chunks along the largest reduced axis bound the size of the temporaries
+        split_axis = max(axis, key=lambda ax: t.shape[ax]) if axis else 0
+        n_chunks = max(1, min(-(-t.size // self._CHUNK_SIZE), t.shape[split_axis])) if axis else 1
+        offsets = (np.arange(self._counts[..., 0].size) * self._values.size - value_info.min)[:, None]
+        counts = self._counts.reshape(-1)
+        for chunk in np.array_split(t, n_chunks, axis=split_axis):
+            # one row of values per element of the moments
+            idx = np.moveaxis(chunk, kept, tuple(range(len(kept)))).reshape(offsets.shape[0], -1).astype(np.intp)
+            idx += offsets
+            counts += np.bincount(idx.reshape(-1), minlength=counts.size)
+        n_b = int(np.prod([t.shape[ax] for ax in axis], dtype=int))
+        self._n += n_b
+        self._stale = True
+        self._cache.clear()
+        return self
+
+    def __iadd__(self, other: "HistogramMoments") -> "HistogramMoments":
+        """Add the counts of `other` instance to `self` and return modified `self`."""
+        if not isinstance(other, HistogramMoments):
+            raise RuntimeError("Can't add moments to counts, add the counts to a BatchedMoments instance instead.")
+        if not other._initialized:
+            raise RuntimeError("Object not initialized!")
+        if not self._initialized:
+            self._initialize(BatchedMoments._infer_data_shape(other.shape, other.axis))
+        if self.shape != other.shape or self._value_dtype != other._value_dtype:
+            raise RuntimeError("Won't broadcast shapes. You are on your own, sorry.")
+        self._counts += other._counts
+        self._n += other._n
+        self._stale = True
+        self._cache.clear()
+        return self
+
+    def __add__(self, other: "HistogramMoments") -> "HistogramMoments":
+        """Return a new instance where the counts of `self` and `other` are added."""
+        added = copy.deepcopy(self)
+        added += other
+        return added
+
+    @property
+    def counts(self) -> Union[np.ndarray, None]:
+        """The number of occurrences of each value, of shape `(*shape, 2**bits)`."""
+        return self._counts
+
+    @property
+    def mean(self) -> Union[np.ndarray, None]:
+        self._sync()
+        return super().mean
+
+    @property
+    def variance(self) -> Union[np.ndarray, None]:
+        self._sync()
+        return super().variance
+
+    @property
+    def skewness(self) -> Union[np.ndarray, None]:
+        self._sync()
+        return super().skewness
+
+    @property
+    def kurtosis(self) -> Union[np.ndarray, None]:
+        self._sync()
+        return super().kurtosis
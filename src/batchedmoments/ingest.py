@@ -0,0 +1,31 @@
+import numpy as np
+
+
+def _is_chunked(x) -> bool:
+    """Whether `x` is read in chunks instead of being converted at once,
+    i.e. a `np.memmap` or a chunked array container (e.g. a dask or zarr array)."""
+    if isinstance(x, np.memmap):
+        return True
+    return not isinstance(x, np.ndarray) and all(hasattr(x, name) for name in ("chunks", "shape", "dtype", "__getitem__"))
+
+
+def _chunk_length(x, axis: int) -> int:
+    """The length of the chunks of a chunked array container along `axis`, one for arrays."""
+    chunks = getattr(x, "chunks", None)
+    if isinstance(x, np.ndarray) or not chunks:
+        return 1
+    # dask arrays hold the lengths of all chunks, zarr arrays a single length
+    length = chunks[axis]
+    return max(1, max(length) if isinstance(length, tuple) else int(length))
+
+
+def _as_array(x) -> np.ndarray:
+    """Converts `x` to an array, without copying DLPack producers (e.g. CPU tensors), objects exposing
+    the buffer protocol or the array interface. Anything else (e.g. lists) is copied."""
+    if hasattr(x, "__dlpack__") and hasattr(np, "from_dlpack"):
+        try:
+            return np.from_dlpack(x)
+        except (BufferError, RuntimeError, TypeError):
+            # e.g. tensors on other devices or which require gradients, which numpy might still convert
+            pass
+    return np.asarray(x)
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+import time
+import numpy as np
+
+
+class UpdateStats:
+    """Counters and per-phase timings of the updates of an accumulator, see `BatchedMoments(stats=True)`.
+
+    Phases:
+        convert     - conversion of the input to numpy arrays in `__call__`
+        compute     - computation of the moments of the batches
+        merge       - merging the moments of the batches (or other instances) into the accumulated moments
+    """
+
+    PHASES = ("convert", "compute", "merge")
+
+    def __init__(self):
+        self.seconds: dict = {}
+        self.batches: int = 0
+        self.merges: int = 0
+        self.elements: int = 0
+        self.bytes: int = 0
+        self.converted_bytes: int = 0
+        self.temporary_bytes: int = 0
+        self.reset()
+
+    def reset(self):
+        """Sets all counters and timings to zero."""
+        self.seconds = {phase: 0.0 for phase in self.PHASES}
+        self.batches = 0
+        self.merges = 0
+        self.elements = 0
+        self.bytes = 0
+        self.converted_bytes = 0
+        self.temporary_bytes = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        """Adds the wall-clock time of the enclosed block to the phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+    def count(self, t: np.ndarray, temporary_bytes: int):
+        """Counts a batch and the size of the temporaries allocated for it."""
+        self.batches += 1
+        self.elements += t.size
+        self.bytes += t.nbytes
+        self.temporary_bytes += temporary_bytes
+
+    @staticmethod
+    def temporaries(t: np.ndarray, order: int, dtype: np.dtype, weighted: bool, masked: bool) -> int:
+        """The size in bytes of the temporaries (of the size of the batch) the kernels allocate."""
+        if weighted or masked:
+            n_temporaries = 1 if order < 2 and not masked else 2
+        else:
+            n_temporaries = min(order - 1, 2)
+        # the valid elements are stored as boolean array
+        return n_temporaries * t.size * np.dtype(dtype).itemsize + (t.size if masked else 0)
+
+    def as_dict(self) -> dict:
+        return {
+            "seconds": dict(self.seconds),
+            "batches": self.batches,
+            "merges": self.merges,
+            "elements": self.elements,
+            "bytes": self.bytes,
+            "converted_bytes": self.converted_bytes,
+            "temporary_bytes": self.temporary_bytes,
+        }
+
+    def __repr__(self) -> str:
+        seconds = ", ".join(f"{phase} {self.seconds[phase] * 1e3:.2f} ms" for phase in self.PHASES)
+        return f"<UpdateStats ({self.batches} batches, {self.merges} merges, {self.bytes} bytes): {seconds}>"
@@ -0,0 +1,196 @@
+from functools import lru_cache
+from typing import Union
+import math
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def binomial(n: int, k: int) -> int:
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+def pool_moments(n, moments: tuple, axis: tuple) -> tuple:
+    """Pools the moments of all slices along `axis`, where each slice holds the moments of `n` elements
+    (or of `n[i]` elements, if `n` is an array of the shape of the moments).
+
+    With the deviations `d_i` of the slice means from the pooled mean, the pooled central sums are
+    `M_p = sum_i sum_{k=0}^p binom(p, k) M_{k,i} d_i^{p-k}`, where `M_0 = n` and `M_1 = 0`.
+
+    Returns: tuple of pooled moments
+    """
+    if isinstance(n, np.ndarray):
+        total = np.sum(n, axis=axis, keepdims=True)
+        mean = np.sum(n * moments[0], axis=axis, keepdims=True) / np.where(total > 0, total, 1)
+    else:
+        mean = np.mean(moments[0], axis=axis, keepdims=True)
+    delta = moments[0] - mean
+    powers = [None, delta]
+    for _ in range(2, len(moments) + 1):
+        powers.append(powers[-1] * delta)
+    pooled = [np.squeeze(mean, axis=axis)]
+    for p in range(2, len(moments) + 1):
+        m_p = np.sum(n * powers[p], axis=axis) + np.sum(moments[p - 1], axis=axis)
+        for k in range(2, p):
+            m_p += binomial(p, k) * np.sum(moments[k - 1] * powers[p - k], axis=axis)
+        pooled.append(np.asarray(m_p))
+    return tuple(pooled)
+
+
+def pool_block(block: list, stacked: np.ndarray) -> tuple:
+    """Pools a block of element counts and moments, stacked along the first axis of the (reused) buffer.
+
+    Returns: tuple of element count and pooled moments
+    """
+    size = len(block)
+    shape = stacked.shape[2:]
+    counts = [n for n, _ in block]
+    if any(isinstance(n, np.ndarray) for n in counts):
+        n = np.stack([np.broadcast_to(np.asarray(c, dtype=np.float64), shape) for c in counts])
+        total = n.sum(axis=0)
+    else:
+        n = np.asarray(counts, dtype=np.float64).reshape((size,) + (1,) * len(shape))
+        total = sum(counts)
+    for _i, m in enumerate(stacked[:, :size]):
+        np.stack([moments[_i] for _, moments in block], out=m)
+    return total, pool_moments(n, tuple(stacked[:, :size]), (0,))
+
+
+def compute_moments(t: np.ndarray, axis: Union[tuple, None] = None, order: int = 4, dtype: np.dtype = np.float64) -> tuple:
+    """Computes the mean and the central sums `sum_{i=1}^n (x_i - mean)**p`, p = 2, ..., order, over given axis.
+
+    The data is centred once and the powers of the deviations are built up incrementally in a single temporary
+    (i.e. at most two temporaries), thus the batch is read only twice and never copied.
+
+    Returns: tuple of element count and moments
+    """
+    n = int(np.prod([t.shape[x] for x in axis] if axis is not None else t.shape, dtype=int))
+    m1 = np.mean(t, axis=axis, dtype=dtype, keepdims=True)
+    if order < 2:
+        return n, np.squeeze(m1, axis=axis)
+    d = np.subtract(t, m1, dtype=dtype)
+    power = np.multiply(d, d, out=d if order < 3 else None)
+    moments = [np.squeeze(m1, axis=axis), power.sum(axis=axis)]
+    for _ in range(3, order + 1):
+        moments.append(np.multiply(power, d, out=power).sum(axis=axis))
+    return (n, *moments)
+
+
+def compute_weighted_moments(
+        t: np.ndarray,
+        weights: np.ndarray,
+        axis: Union[tuple, None] = None,
+        order: int = 4,
+        dtype: np.dtype = np.float64
+) -> tuple:
+    """Computes the total weight, the weighted mean and the weighted central sums
+    `sum_{i=1}^n w_i (x_i - mean)**p`, p = 2, ..., order, over given axis.
+
+    The weights (with as many dimensions as `t`) are broadcast and never materialized at the size of the batch.
+
+    Returns: tuple of total weight and moments
+    """
+    reduced = axis if axis is not None else tuple(range(t.ndim))
+    repeats = np.prod([t.shape[ax] for ax in reduced if weights.shape[ax] == 1], dtype=np.float64)
+    w = float(np.sum(weights, dtype=np.float64) * repeats)
+    if w == 0:  # e.g. zero frequencies, the moments of no elements are zero
+        shape = tuple(d for ax, d in enumerate(t.shape) if ax not in reduced)
+        return (0.0, *(np.zeros(shape, dtype=dtype) for _ in range(order)))
+    wd = np.multiply(t, weights, dtype=dtype)
+    m1 = np.sum(wd, axis=axis, keepdims=True) / w
+    moments = [np.squeeze(m1, axis=axis)]
+    if order < 2:
+        return (w, *moments)
+    d = np.subtract(t, m1, dtype=dtype)
+    np.multiply(d, weights, out=wd)
+    for _ in range(1, order):
+        moments.append(np.multiply(wd, d, out=wd).sum(axis=axis))
+    return (w, *moments)
+
+
+def compute_masked_moments(
+        t: np.ndarray,
+        valid: np.ndarray,
+        axis: Union[tuple, None] = None,
+        order: int = 4,
+        dtype: np.dtype = np.float64
+) -> tuple:
+    """Computes the counts, the mean and the central sums `sum_{i=1}^n (x_i - mean)**p`, p = 2, ..., order,
+    of the valid elements over given axis.
+
+    Masked elements (which might be NaN) are zeroed in the centred data, thus they don't contribute.
+    Elements of the moments without any valid element have zero moments.
+
+    Returns: tuple of element counts and moments
+    """
+    n = np.sum(valid, axis=axis, dtype=np.float64, keepdims=True)
+    m1 = np.sum(t, axis=axis, where=valid, dtype=dtype, keepdims=True) / np.maximum(n, 1).astype(dtype)
+    moments = [np.squeeze(m1, axis=axis)]
+    if order > 1:
+        d = np.subtract(t, m1, dtype=dtype)
+        np.copyto(d, 0, where=~valid)
+        power = np.multiply(d, d)
+        moments.append(power.sum(axis=axis))
+        for _ in range(2, order):
+            moments.append(np.multiply(power, d, out=power).sum(axis=axis))
+    return (np.squeeze(n, axis=axis), *moments)
+
+
+def merge_increments(n_a, a: tuple, n_b, b: tuple) -> tuple:
+    """Computes the increments of the moments `a` of `n_a` elements, when merged with the moments `b` of `n_b` elements.
+
+    With `delta = mean_b - mean_a`, the increment of the p-th central sum is
+    `M_{p,b} + sum_{k=1}^{p-2} binom(p, k) delta^k ((-n_b / n)^k M_{p-k,a} + (n_a / n)^k M_{p-k,b})
+    + delta^p n_a n_b / n ((n_a / n)^{p-1} - (-n_b / n)^{p-1})`.
+    Only as many moments as given in `a` are computed.
+
+    References:
+        Pébay, Philippe. "Formulas for robust, one-pass parallel computation of covariances and arbitrary-order
+         statistical moments." Sandia Report SAND2008-6212, Sandia National Laboratories 94 (2008).
+
+    Returns: tuple of increments
+    """
+    n = n_a + n_b
+    if isinstance(n, np.ndarray):
+        # elements of the moments without any elements keep zero moments
+        n = np.where(n > 0, n, 1)
+    elif n == 0:
+        return tuple(np.zeros_like(m) for m in b)
+    order = len(a)
+    delta = b[0] - a[0]
+    # the powers of delta and of the (signed) fractions of the elements are shared by all moments
+    deltas, fractions_a, fractions_b = [1.0, delta], [1.0], [1.0]
+    for _ in range(2, order + 1):
+        deltas.append(deltas[-1] * delta)
+    for _ in range(1, order):
+        fractions_a.append(fractions_a[-1] * (-n_b / n))
+        fractions_b.append(fractions_b[-1] * (n_a / n))
+    increments = [delta * n_b / n]
+    for p in range(2, order + 1):
+        increment = b[p - 1] + deltas[p] * (n_a * n_b / n * (fractions_b[p - 1] - fractions_a[p - 1]))
+        for k in range(1, p - 1):
+            increment = increment + binomial(p, k) * deltas[k] * (
+                fractions_a[k] * a[p - k - 1] + fractions_b[k] * b[p - k - 1]
+            )
+        increments.append(increment)
+    return tuple(increments)
+
+
+def split_moments(n, moments: tuple, n_b, b: tuple) -> tuple:
+    """Computes the moments `a` of `n - n_b` elements, which merged with the moments `b` of `n_b` elements
+    result in `moments`, i.e. the inverse of merging (see `merge_increments`).
+
+    The increment of the p-th moment depends on lower moments of `a` only, thus `a` is recovered moment by moment.
+
+    Returns: tuple of moments
+    """
+    n_a = n - n_b
+    # elements of the moments without any remaining elements have zero moments
+    empty = n_a <= 0
+    n_a_safe = np.where(empty, 1, n_a) if isinstance(n_a, np.ndarray) else max(n_a, 1)
+    a = [moments[0] - (b[0] - moments[0]) * n_b / n_a_safe]
+    for p in range(2, len(moments) + 1):
+        # the p-th moment of `a` doesn't enter its own increment, any placeholder will do
+        increments = merge_increments(n_a, tuple(a) + (moments[p - 1],), n_b, b[:p])
+        m_p = moments[p - 1] - increments[p - 1]
+        a.append(np.maximum(m_p, 0) if p == 2 else m_p)
+    return tuple(np.where(empty, 0, m) for m in a)
@@ -0,0 +1,985 @@
+# pylint: disable=unsubscriptable-object,too-many-public-methods
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Union, Iterable
+import json
+import os
+import pickle
+import struct
+import warnings
+import numpy as np
+
+from .ingest import _as_array, _chunk_length, _is_chunked
+from .instrumentation import UpdateStats
+from .kernels import (
+    compute_moments, compute_weighted_moments, compute_masked_moments, merge_increments, split_moments, pool_moments,
+    pool_block
+)
+from .parallel import _parallel_update
+from .pipeline import _aconsume, _consume
+from .ragged import _ragged_blocks
+from .sketch import QuantileSketch
+from .workspace import Workspace
+
+
+# the phases of instances without instrumentation
+_NO_PHASE = nullcontext()
+
+
+class BatchedMoments:
+    """Computes (batch-wise) sample statistics.
+
+    Properties:
+        mean        - returns the sample mean
+        variance    - returns the sample variance
+        std         - returns the sample standard deviation
+        skewness    - returns the sample skewness
+        kurtosis    - return the sample kurtosis
+
+    """
+
+    # views of the first moments, any higher moments are accessed via `_moments`
+    _MOMENTS = ("_m1", "_m2", "_m3", "_m4")
+    # smallest number of elements per thread worth the overhead of threading
+    _MIN_CHUNK_SIZE = 1 << 16
+    # default size of the chunks read from (out-of-core) arrays
+    _CHUNK_BYTES = 1 << 26
+    # whether batches may be split into chunks which are merged one by one, see `__call__`
+    _SPLIT_BATCHES = True
+    # smallest number of instances worth pooling at once in `merge_all`
+    _MIN_BLOCK_SIZE = 16
+    # binary format of the state: magic, header size, json header, padding, moments (and compensation)
+    _FORMAT_MAGIC = b"BMOM"
+    _FORMAT_VERSION = 1
+    _FORMAT_ALIGNMENT = 64
+    # the kernels of the moments, see `kernels`
+    _compute_moments = staticmethod(compute_moments)
+    _compute_weighted_moments = staticmethod(compute_weighted_moments)
+    _compute_masked_moments = staticmethod(compute_masked_moments)
+    _merge_increments = staticmethod(merge_increments)
+    _split_moments = staticmethod(split_moments)
+    _pool_moments = staticmethod(pool_moments)
+    _pool_block = staticmethod(pool_block)
+
+    def __init__(
+            self,
+            axis: Union[tuple, int] = None,
+            shape: tuple = None,
+            ddof: int = 0,
+            *,
+            order: int = 4,
+            dtype: np.dtype = np.float64,
+            compensated: bool = False,
+            n_threads: Union[int, None] = 1,
+            skipna: bool = False,
+            workspace: bool = False,
+            stats: bool = False,
+            extrema: bool = False,
+            quantiles: Union[int, None] = None
+    ):
+        """
+        Args:
+            axis: Axis to be reduced. If None, a scalar value is computed (default)
+            shape: Shape of the moments. If None, first update will initialize and set shape.
+            ddof: "Delta Degrees of Freedom": the divisor used in the calculation is
+                    ``N - ddof``, where ``N`` represents the number of elements. (default is zero)
+            order: Highest moment to be tracked, e.g. 2 if only mean and variance are needed,
+                    or 6 for the central moments up to the sixth order. (default is four)
+            dtype: Floating point type of the moments and of the computations. (default is float64)
+            compensated: If True, the moments are accumulated with Kahan summation,
+                    which keeps long streams accurate with low precision dtypes. (default is False)
+            n_threads: Number of threads used to compute the moments of large batches.
+                    If None, all CPUs are used. (default is one)
+            skipna: If True, NaNs are skipped, like masked elements. (default is False)
+            workspace: If True, the temporaries of the updates are kept for each shape of the batches,
+                    thus updates with batches of known shapes don't allocate memory.
+                    Used for updates without weights and masks of non-compensated moments only. (default is False)
+            stats: If True, the updates are instrumented, see `stats`. (default is False)
+            extrema: If True, the minimum and maximum are tracked as well. (default is False)
+            quantiles: If not None, the quantiles are tracked with a sketch of the given capacity
+                    (see `QuantileSketch`), e.g. 200 for a rank error of about 1%.
+                    Not supported for updates with weights or masked elements. (default is None)
+        """
+        if order < 1:
+            raise ValueError(f"Order must be at least 1, got {order}.")
+        if not np.issubdtype(dtype, np.floating):
+            raise ValueError(f"Dtype must be a floating point type, got {np.dtype(dtype)}.")
+        if skipna and quantiles is not None:
+            raise ValueError("Quantiles can't be tracked with skipped NaNs.")
+        # number of elements, an array of the shape of the moments if elements were masked
+        self._n: Union[int, float, np.ndarray] = 0
+        self._ddof = ddof
+        self._skipna = skipna
+        self._order = order
+        self._dtype = np.dtype(dtype)
+        self._compensated = compensated
+        self._compensation: Union[tuple, None] = None
+        # all moments (and compensations) are views of a single contiguous buffer
+        self._state: Union[np.ndarray, None] = None
+        self._n_threads = n_threads if n_threads is not None else os.cpu_count()
+        self._workspace: Union[Workspace, None] = Workspace() if workspace else None
+        self._stats: Union[UpdateStats, None] = UpdateStats() if stats else None
+        # statistics computed alongside the moments, see `_update_extras`
+        self._extrema = extrema
+        self._quantiles = quantiles
+        self._min: Union[np.ndarray, None] = None
+        self._max: Union[np.ndarray, None] = None
+        self._sketch: Union[QuantileSketch, None] = None
+        # derived statistics, computed on first access after the state changed
+        self._cache: dict = {}
+        self.axis: Union[tuple, None] = None
+        if axis is not None:
+            self.axis = axis if isinstance(axis, tuple) else tuple([axis])
+        self._m1: Union[np.ndarray, None] = None
+        self._m2: Union[np.ndarray, None] = None
+        self._m3: Union[np.ndarray, None] = None
+        self._m4: Union[np.ndarray, None] = None
+        self._initialized: bool = False
+        self._moments_shape: Union[tuple, None] = None
+        if shape is not None:  # initialization is possible
+            self._initialize(self._infer_data_shape(shape, self.axis))
+
+    @staticmethod
+    def _infer_data_shape(moments_shape, axis):
+        axis = tuple([]) if axis is None else axis
+        # data shape / dimensions must be
+        data_shape = [0] * (len(axis) + len(moments_shape))
+        shape_idx = 0
+        for ax, _ in enumerate(data_shape):
+            if ax in axis:  # axis have fixed position
+                data_shape[ax] = -1
+            else:  # fill in the rest
+                data_shape[ax] = moments_shape[shape_idx]
+                shape_idx += 1
+        if shape_idx != len(moments_shape):
+            raise RuntimeError("There is something wrong with the shapes!")
+        return tuple(data_shape)
+
+    def __len__(self):
+        # with masked elements, the number of elements of the moments differ
+        return int(np.max(self._n))
+
+    def reduce(self, axis: Union[tuple, int] = None) -> "BatchedMoments":
+        """Reduce the moments along the given axis.
+
+        All slices along the axes are pooled at once, see `_pool_moments`.
+
+        Args:
+            axis: Axis to be reduced. If None, a scalar value is computed (default)
+
+        Returns:
+            the reduced moments
+        """
+        if not self._initialized:
+            raise RuntimeError("Object not initialized!")
+        if axis is None:
+            axis = tuple(range(len(self.shape)))
+        axis = tuple(sorted({ax % len(self.shape) for ax in (axis if isinstance(axis, tuple) else tuple([axis]))}))
+        # map the axes of the moments to the axes of the data
+        data_axis = self.axis if self.axis is not None else tuple()
+        kept_axis = [ax for ax in range(len(data_axis) + len(self.shape)) if ax not in data_axis]
+        _w = BatchedMoments(
+            tuple(sorted(data_axis + tuple(kept_axis[ax] for ax in axis))) if self.axis is not None else None,
+            tuple(d for _i, d in enumerate(self.shape) if _i not in axis),
+            ddof=self.ddof,
+            order=self.order,
+            dtype=self.dtype,
+            compensated=self._compensated,
+            n_threads=self._n_threads,
+            skipna=self._skipna,
+            workspace=self._workspace is not None,
+            extrema=self._extrema,
+            quantiles=self._quantiles
+        )
+        if self._extrema:
+            _w._min, _w._max = self._min.min(axis=axis), self._max.max(axis=axis)
+        if self._sketch is not None:
+            _w._sketch = self._sketch.reduce(axis)
+        if isinstance(self._n, np.ndarray):
+            _w._n = self._n.sum(axis=axis)
+        else:
+            _w._n = self._n * int(np.prod([self.shape[ax] for ax in axis], dtype=int))
+        _w._moments = self._pool_moments(self._n, self._moments, axis)
+        return _w
+
+    @property
+    def _moments(self) -> tuple:
+        """The tracked moments, i.e. M1 up to M`order`."""
+        return tuple(self._state[_i, ...] for _i in range(self._order)) if self._state is not None else (None,) * self._order
+
+    @_moments.setter
+    def _moments(self, moments: tuple):
+        self._cache.clear()
+        for _i, m in enumerate(moments):
+            self._state[_i, ...] = m
+
+    def _bind_state(self, state: Union[np.ndarray, None]):
+        """Sets the buffer of the moments (and compensations), of shape `(order [* 2], *shape)`."""
+        self._cache.clear()
+        self._state = state
+        for _i, name in enumerate(self._MOMENTS):
+            setattr(self, name, state[_i, ...] if state is not None and _i < self._order else None)
+        self._compensation = None
+        if state is not None and self._compensated:
+            self._compensation = tuple(state[self._order + _i, ...] for _i in range(self._order))
+
+    def _sync(self):
+        """Brings the moments up to date before the state is exported."""
+
+    def _add_increments(self, increments: tuple):
+        """Adds the increments to the moments in place, using Kahan summation if compensated."""
+        self._cache.clear()
+        if not self._compensated:
+            for m, increment in zip(self._moments, increments):
+                m += increment
+            return
+        for m, c, increment in zip(self._moments, self._compensation, increments):
+            y = np.subtract(increment, c, dtype=self._dtype)
+            total = m + y
+            # the low-order bits lost in `total`, recovered in the next addition
+            np.subtract(total, m, out=c)
+            c -= y
+            m[...] = total
+
+    def _batch_moments(
+            self,
+            t: np.ndarray,
+            weights: Union[np.ndarray, None] = None,
+            valid: Union[np.ndarray, None] = None
+    ) -> list:
+        """Computes the moments of the batch, split into chunks along the largest reduced axis if multiple threads are used.
+
+        Returns: list of element count (or total weight) and moments of each chunk
+        """
+        kwargs = {"axis": self.axis, "order": self._order, "dtype": self._dtype}
+        compute, args = partial(self._compute_moments, **kwargs), [t]
+        if weights is not None:
+            compute, args = partial(self._compute_weighted_moments, **kwargs), [t, weights]
+        if valid is not None:
+            compute, args = partial(self._compute_masked_moments, **kwargs), [t, valid]
+        axis = self.axis if self.axis is not None else tuple(range(t.ndim))
+        if self._n_threads < 2 or not axis:
+            return [compute(*args)]
+        split_axis = max(axis, key=lambda ax: t.shape[ax])
+        n_chunks = min(self._n_threads, t.size // self._MIN_CHUNK_SIZE, t.shape[split_axis])
+        if n_chunks < 2:
+            return [compute(*args)]
+        chunks = [
+            np.array_split(x, n_chunks, axis=split_axis) if x.shape[split_axis] > 1 else [x] * n_chunks
+            for x in args
+        ]
+        # numpy releases the GIL, thus the chunks are computed concurrently
+        with ThreadPoolExecutor(n_chunks) as pool:
+            return list(pool.map(compute, *chunks))
+
+    def _expand_weights(self, t: np.ndarray, weights) -> np.ndarray:
+        """Checks the weights and prepends axes, such that they have as many dimensions as `t`."""
+        weights = np.asarray(weights)
+        if weights.ndim > t.ndim:
+            raise RuntimeError("Weights have more dimensions than the data.")
+        weights = weights.reshape((1,) * (t.ndim - weights.ndim) + weights.shape)
+        axis = self.axis if self.axis is not None else tuple(range(t.ndim))
+        if any(
+            s != 1 and (s != d or ax not in axis)
+            for ax, (s, d) in enumerate(zip(weights.shape, t.shape))
+        ):
+            raise RuntimeError("Weights must broadcast against the data and vary along the reduced axes only.")
+        return weights
+
+    def _valid(self, t: np.ndarray, mask) -> Union[np.ndarray, None]:
+        """The valid (neither masked nor skipped NaN) elements of `t`, None if all elements are valid."""
+        invalid = None
+        if mask is not None:
+            invalid = np.broadcast_to(np.asarray(mask, dtype=bool), t.shape)
+        if self._skipna and np.issubdtype(t.dtype, np.inexact):
+            invalid = np.isnan(t) if invalid is None else np.logical_or(np.isnan(t), invalid)
+        return np.logical_not(invalid) if invalid is not None else None
+
+    def update(
+            self,
+            t: np.ndarray,
+            weights: Union[np.ndarray, None] = None,
+            mask: Union[np.ndarray, None] = None
+    ) -> "BatchedMoments":
+        """Updates the moments with the batch `t`.
+
+        Args:
+            t: batch of data
+            weights: Optional weights (e.g. frequencies) of the elements, which broadcast against `t`
+                    (numpy rules) and vary along the reduced axes only, e.g. of shape `(N, 1, 1, 1)`
+                    for weights of samples in a batch of shape `(N, C, H, W)` reduced over `axis=(0, 2, 3)`.
+                    The number of elements is replaced by the total weight.
+            mask: Optional boolean mask (broadcast against `t`), where True marks invalid elements to be skipped.
+                    With masked elements, the number of elements is counted for each element of the moments.
+                    Can't be combined with weights.
+
+        Returns:
+            self
+        """
+        if t.ndim == 0:  # the kernels compute in place, which requires arrays
+            t = t.reshape(1)
+        valid = self._valid(t, mask)
+        if weights is not None:
+            if valid is not None:
+                raise RuntimeError("Weights can't be combined with masked (or skipped NaN) elements.")
+            weights = self._expand_weights(t, weights)
+        if self._extrema or self._sketch is not None:
+            with self._phase("compute"):
+                self._update_extras(t, weights, valid)
+        if self._workspace is not None and weights is None and valid is None and not self._compensated:
+            return self._update_in_place(t)
+        with self._phase("compute"):
+            batch_moments = self._batch_moments(t, weights, valid)
+        with self._phase("merge"):
+            for n_b, *moments_b in batch_moments:
+                self._add_increments(self._merge_increments(self._n, self._moments, n_b, moments_b))
+                # increment seen samples
+                self._n += n_b
+        if self._stats is not None:
+            self._stats.count(t, UpdateStats.temporaries(t, self._order, self._dtype, weights is not None, valid is not None))
+        return self
+
+    def _update_extras(self, t: np.ndarray, weights: Union[np.ndarray, None], valid: Union[np.ndarray, None]):
+        """Updates the extrema (unaffected by the weights) and the quantile sketch with the batch `t`."""
+        axis = self.axis if self.axis is not None else tuple(range(t.ndim))
+        if self._sketch is not None:
+            if weights is not None or valid is not None:
+                raise RuntimeError("Quantiles can't be tracked with weights or masked (or skipped NaN) elements.")
+            # the values of each element of the moments along the first axis
+            self._sketch.update(np.moveaxis(t, axis, tuple(range(len(axis)))).reshape((-1,) + self._moments_shape))
+        if self._extrema:
+            self._cache.clear()
+            where = valid if valid is not None else True
+            np.minimum(self._min, np.minimum.reduce(t, axis, self._dtype, initial=np.inf, where=where), out=self._min)
+            np.maximum(self._max, np.maximum.reduce(t, axis, self._dtype, initial=-np.inf, where=where), out=self._max)
+
+    def _add_extras(self, other: "BatchedMoments"):
+        """Merges the extrema and the quantile sketch of `other` into `self`."""
+        if self._extrema:
+            if not other._extrema:
+                raise RuntimeError("Can't add moments without extrema to moments with extrema.")
+            np.minimum(self._min, other._min, out=self._min)
+            np.maximum(self._max, other._max, out=self._max)
+        if self._sketch is not None:
+            if other._sketch is None:
+                raise RuntimeError("Can't add moments without quantiles to moments with quantiles.")
+            self._sketch.merge(other._sketch)
+
+    def _update_in_place(self, t: np.ndarray) -> "BatchedMoments":
+        """Updates the moments with the batch `t`, using the buffers of the workspace for all temporaries."""
+        allocated = self._workspace.allocated_bytes
+        with self._phase("compute"):
+            n_b, *moments_b = self._workspace.compute_moments(t, self.axis, self._order, self._dtype, self._moments_shape)
+        if n_b > 0:
+            self._cache.clear()
+            with self._phase("merge"):
+                self._workspace.merge(self._n, self._moments, n_b, moments_b)
+            self._n += n_b
+        if self._stats is not None:
+            self._stats.count(t, self._workspace.allocated_bytes - allocated)
+        return self
+
+    def update_ragged(self, arrays: Iterable, block_size: int = 256) -> "BatchedMoments":
+        """Updates the moments with arrays which differ along the reduced axes only,
+        e.g. images of different sizes of shape `(N, C, H, W)` reduced over `axis=(0, 2, 3)`.
+
+        The arrays are neither padded nor concatenated: small arrays of equal shape are grouped and their moments
+        computed at once, larger arrays one by one. The moments of up to `block_size` groups are pooled at once
+        (see `merge_all`) and merged into `self`.
+        Subclasses which track further state in `update` are updated with each array instead.
+
+        Args:
+            arrays: iterable of arrays, e.g. a list or a generator
+
+        Returns:
+            self
+        """
+        if type(self).update is not BatchedMoments.update:
+            for t in arrays:
+                self(t)
+            return self
+        blocks = []
+        for block in _ragged_blocks(self, arrays, self._MIN_CHUNK_SIZE):
+            blocks.append(block)
+            if len(blocks) == block_size:
+                self._merge_blocks(blocks)
+                blocks = []
+        if blocks:
+            self._merge_blocks(blocks)
+        return self
+
+    def _merge_blocks(self, blocks: list):
+        """Pools the pairs of element count and moments and merges them into the moments."""
+        with self._phase("merge"):
+            if len(blocks) > 1:
+                stacked = np.empty((self._order, len(blocks), *self._moments_shape), dtype=self._dtype)
+                blocks = [self._pool_block(blocks, stacked)]
+            n_b, moments_b = blocks[0]
+            self._add_increments(self._merge_increments(self._n, self._moments, n_b, moments_b))
+            self._n = self._n + n_b
+
+    def _chunks(self, t: np.ndarray, chunk_bytes: int) -> Iterable:
+        """Yields chunks of at most `chunk_bytes` (but at least one slice) along the first reduced axis of `t`."""
+        axis = self.axis if self.axis is not None else tuple(range(t.ndim))
+        if not axis:
+            yield t
+            return
+        # for C ordered arrays, the chunks of the outermost axis are contiguous
+        ax = min(axis)
+        step = max(1, chunk_bytes // max(1, t.nbytes // max(1, t.shape[ax])))
+        # the chunks of chunked array containers are read whole
+        length = _chunk_length(t, ax)
+        step = max(length, step - step % length)
+        index = [slice(None)] * t.ndim
+        for st in range(0, t.shape[ax], step):
+            index[ax] = slice(st, st + step)
+            yield t[tuple(index)]
+
+    def update_memmap(self, t: np.ndarray, chunk_bytes: int = None, prefetch: bool = True) -> "BatchedMoments":
+        """Updates the moments with an array which might not fit into memory, e.g. a `np.memmap`.
+
+        The array is read in chunks along the first reduced axis, each chunk is read exactly once,
+        thus the memory needed is bounded by the chunk size instead of the size of the array.
+
+        Args:
+            t: array, e.g. `np.memmap` or `np.load(..., mmap_mode="r")`
+            chunk_bytes: Size of the chunks in bytes. (default is 64 MiB)
+            prefetch: If True, the next chunk is read by a background thread while the current one is processed.
+
+        Returns:
+            self
+        """
+        if not self._initialized:
+            self._initialize(t.shape)
+        chunks = self._chunks(t, chunk_bytes if chunk_bytes is not None else self._CHUNK_BYTES)
+        if not prefetch:
+            for chunk in chunks:
+                self.update(np.array(chunk))
+            return self
+        with ThreadPoolExecutor(1) as pool:
+            pending = None
+            for chunk in chunks:
+                loading = pool.submit(np.array, chunk)
+                if pending is not None:
+                    self.update(pending.result())
+                pending = loading
+            if pending is not None:
+                self.update(pending.result())
+        return self
+
+    @classmethod
+    def from_file(
+            cls,
+            path: Union[str, os.PathLike],
+            axis: Union[tuple, int] = None,
+            chunk_bytes: int = None,
+            prefetch: bool = True,
+            **kwargs
+    ) -> "BatchedMoments":
+        """Computes the moments of an array stored in a `.npy` file, without loading it into memory.
+
+        Args:
+            path: path of the `.npy` file
+            axis: Axis to be reduced. If None, a scalar value is computed (default)
+            chunk_bytes: Size of the chunks in bytes. (default is 64 MiB)
+            prefetch: If True, the next chunk is read by a background thread while the current one is processed.
+            **kwargs: further arguments of the class, e.g. `ddof` or `order`
+
+        Returns:
+            the moments of the array
+        """
+        return cls(axis, **kwargs).update_memmap(np.load(path, mmap_mode="r"), chunk_bytes=chunk_bytes, prefetch=prefetch)
+
+    def parallel_update(self, source: Iterable, processes: int = None) -> "BatchedMoments":
+        """Updates the moments with the batches of `source`, computed by multiple processes.
+
+        The batches are handed to the workers via shared memory, thus neither the batches nor the moments
+        are pickled per batch. Each worker keeps a local accumulator, which are merged into `self` at the end.
+
+        Args:
+            source: iterable of batches, e.g. a generator
+            processes: Number of worker processes. If None, all CPUs are used.
+
+        Returns:
+            self
+        """
+        accumulators = _parallel_update(self, source, processes if processes is not None else os.cpu_count())
+        if accumulators:
+            self += BatchedMoments.merge_all(accumulators)
+        return self
+
+    def consume(self, source: Iterable, prefetch: int = 2, workers: int = 1, ordered: bool = True) -> "BatchedMoments":
+        """Updates the moments with the batches of `source`, e.g. a data loader.
+        The batches are loaded by a background thread, thus loading overlaps with computing the moments.
+
+        Args:
+            source: iterable of batches
+            prefetch: Number of batches loaded ahead.
+            workers: Number of threads computing the moments of the batches into partial accumulators,
+                    which are merged into `self`. (default is one, i.e. `self` is updated directly)
+            ordered: If True, the partial accumulators are merged in the order of the batches (reproducible),
+                    otherwise as soon as they are computed.
+
+        Returns:
+            self
+        """
+        return _consume(self, source, prefetch, workers, ordered)
+
+    async def aconsume(self, source, prefetch: int = 2, workers: int = 1, ordered: bool = True) -> "BatchedMoments":
+        """Like `consume`, for asynchronous iterables of batches, which are loaded by the event loop."""
+        return await _aconsume(self, source, prefetch, workers, ordered)
+
+    def _initialize(self, shape: Union[tuple, None]) -> bool:
+        """Initialize buffers with the given shape of the data.
+        The shape of the buffers is deduced from the data shape and the axis variable.
+        """
+        # reset stats
+        self._n = 0
+        self._bind_state(None)
+        non_none_axis = self.axis if self.axis is not None else []
+        self._moments_shape = tuple([
+            x
+            for _i, x in enumerate(shape)
+            if _i not in non_none_axis
+        ] if self.axis is not None else [])
+        n_buffers = 2 * self._order if self._compensated else self._order
+        self._bind_state(np.zeros((n_buffers, *self._moments_shape), dtype=self._dtype))
+        if self._extrema:
+            self._min = np.full(self._moments_shape, np.inf, dtype=self._dtype)
+            self._max = np.full(self._moments_shape, -np.inf, dtype=self._dtype)
+        if self._quantiles is not None:
+            self._sketch = QuantileSketch(self._quantiles, self._moments_shape, self._dtype)
+        self._initialized = True
+        return self._initialized
+
+    def __eq__(self, other):
+        if (  # axis is not compared, the shape of the moments is more important
+            not isinstance(other, BatchedMoments)
+            or self.shape != other.shape
+            or self.ddof != other.ddof
+            or self.order != other.order
+        ):
+            return False
+        # identical moments are equal, without computing any statistic
+        if np.array_equal(self._n, other._n) and all(
+            np.array_equal(a, b) for a, b in zip(self._moments, other._moments)
+        ):
+            return True
+        # check values of moments
+        return all(
+            np.allclose(a, b, equal_nan=True)
+            for a, b in zip(self._statistics(), other._statistics())
+        )
+
+    def __call__(
+            self,
+            x: Union[np.ndarray, Iterable, float, int],
+            weights: Union[np.ndarray, None] = None,
+            mask: Union[np.ndarray, None] = None
+    ) -> "BatchedMoments":
+        # check input
+        if x is None:
+            return self
+        # memory-mapped and chunked arrays (e.g. dask or zarr) are read in chunks, never at once,
+        # unless weights or masks are given, which are converted with the array
+        if self._SPLIT_BATCHES and _is_chunked(x) and weights is None and mask is None:
+            return self.update_memmap(x)
+        # masked arrays are split into data and mask, without copying
+        if isinstance(x, np.ma.MaskedArray):
+            if x.mask is not np.ma.nomask:
+                mask = x.mask if mask is None else np.logical_or(x.mask, mask)
+            x = x.data
+        # convert to numpy if necessary, without copying if possible
+        if not isinstance(x, np.ndarray):
+            with self._phase("convert"):
+                x = _as_array(x)
+            if self._stats is not None and x.flags.owndata:
+                self._stats.converted_bytes += x.nbytes
+        # check if initialized
+        if not self._initialized:
+            self._initialize(x.shape)
+        # perform update
+        return self.update(x, weights=weights, mask=mask)
+
+    def _phase(self, name: str):
+        """Context of a phase of the updates, which is timed if the updates are instrumented."""
+        return self._stats.phase(name) if self._stats is not None else _NO_PHASE
+
+    @staticmethod
+    def from_(other: "BatchedMoments") -> "BatchedMoments":
+        """Create and initiate class from another instance."""
+        if not other._initialized:
+            raise RuntimeError("Can't initialize from non-initialized object.")
+        return BatchedMoments(
+            other.axis,
+            other.shape,
+            ddof=other.ddof,
+            order=other.order,
+            dtype=other.dtype,
+            compensated=other._compensated,
+            n_threads=other._n_threads,
+            skipna=other._skipna,
+            workspace=other._workspace is not None,
+            extrema=other._extrema,
+            quantiles=other._quantiles
+        )
+
+    def __iadd__(self, other: "BatchedMoments") -> "BatchedMoments":
+        """Add `other` instance to `self` and return modified `self`."""
+        if not other._initialized:
+            raise RuntimeError("Object not initialized!")
+        if not self._initialized:
+            # `from_(...)` can't be used, because `iadd` must modify `self`.
+            self._initialize(BatchedMoments._infer_data_shape(other.shape, other.axis))
+        if self.shape != other.shape:
+            raise RuntimeError("Won't broadcast shapes. You are on your own, sorry.")
+        if self.order > other.order:
+            raise RuntimeError(f"Can't add moments of order {other.order} to moments of order {self.order}.")
+        if self.axis != other.axis:
+            warnings.warn("Axis in `__iadd__` differs.", RuntimeWarning)
+
+        with self._phase("merge"):
+            self._add_extras(other)
+            self._add_increments(self._merge_increments(self._n, self._moments, other._n, other._moments[:self._order]))
+        self._n = self._n + other._n
+        if self._stats is not None:
+            self._stats.merges += 1
+        return self
+
+    def __add__(self, other: "BatchedMoments") -> "BatchedMoments":
+        """Return a new instance where `self` and `other` are added."""
+        added = BatchedMoments.from_(self) if self._initialized else BatchedMoments.from_(other)
+        if self._initialized:
+            added += self
+        if other._initialized:
+            added += other
+        return added
+
+    @staticmethod
+    def merge_all(states: Iterable["BatchedMoments"], block_size: int = 256) -> "BatchedMoments":
+        """Merge many instances at once, e.g. the partial results of workers.
+
+        The moments of up to `block_size` instances are stacked into a reused buffer and pooled at once
+        (see `_pool_moments`), the pooled blocks are merged the same way until a single block remains.
+        Compared to a sequence of `+=`, no moments are allocated per instance and the rounding errors
+        don't accumulate from left to right.
+
+        Args:
+            states: Instances to be merged, non-initialized instances are skipped.
+            block_size: Number of instances pooled at once, further bounded such that the stacked buffer
+                    doesn't exceed 64 MiB.
+
+        Returns:
+            a new instance with the options of the first initialized instance
+        """
+        if block_size < 2:
+            raise ValueError(f"Block size must be at least 2, got {block_size}.")
+        states = [state for state in states if state._initialized]
+        if not states:
+            raise RuntimeError("Nothing to merge, no instance is initialized!")
+        merged = BatchedMoments.from_(states[0])
+        for state in states:
+            if state.shape != merged.shape:
+                raise RuntimeError("Won't broadcast shapes. You are on your own, sorry.")
+            if merged.order > state.order:
+                raise RuntimeError(f"Can't add moments of order {state.order} to moments of order {merged.order}.")
+            if state.axis != merged.axis:
+                warnings.warn("Axis in `merge_all` differs.", RuntimeWarning)
+            merged._add_extras(state)
+        blocks = [(state._n, state._merge_moments(merged.order)) for state in states]
+        # the stacked moments (and the temporaries of pooling them) are bounded by the chunk size
+        max_size = max(2, merged._CHUNK_BYTES // max(1, merged._state[:merged.order].nbytes))
+        if max_size < BatchedMoments._MIN_BLOCK_SIZE and not any(isinstance(state._n, np.ndarray) for state in states):
+            # large moments are merged pairwise in place instead, pooling small blocks doesn't pay off
+            blocks = [Workspace().cascade(blocks)]
+        while len(blocks) > 1:
+            size = min(block_size, max_size, len(blocks))
+            stacked = np.empty((merged.order, size, *merged.shape), dtype=merged.dtype)
+            blocks = [
+                BatchedMoments._pool_block(blocks[_i:_i + size], stacked)
+                for _i in range(0, len(blocks), size)
+            ]
+        n, merged._moments = blocks[0]
+        merged._n = n.copy() if isinstance(n, np.ndarray) else n
+        return merged
+
+    def _merge_moments(self, order: int) -> tuple:
+        """The moments up to `order`, with the compensations folded in if compensated."""
+        moments = self._moments[:order]
+        if self._compensated:
+            return tuple(m - c for m, c in zip(moments, self._compensation[:order]))
+        return moments
+
+    def _header(self) -> dict:
+        return {
+            "version": self._FORMAT_VERSION,
+            "n": self._n,
+            "ddof": self._ddof,
+            "axis": list(self.axis) if self.axis is not None else None,
+            "shape": list(self._moments_shape),
+            "order": self._order,
+            "dtype": self._dtype.str,
+            "compensated": self._compensated,
+            "n_threads": self._n_threads,
+            "skipna": self._skipna,
+        }
+
+    @staticmethod
+    def _from_header(header: dict, buffer) -> "BatchedMoments":
+        """Creates an instance from a header and a buffer of the state, the buffer is used without copying if writeable."""
+        if header["version"] != BatchedMoments._FORMAT_VERSION:
+            raise RuntimeError(f"Unsupported format version {header['version']}.")
+        bm = BatchedMoments(
+            tuple(header["axis"]) if header["axis"] is not None else None,
+            ddof=header["ddof"],
+            order=header["order"],
+            dtype=header["dtype"],
+            compensated=header["compensated"],
+            n_threads=header["n_threads"],
+            skipna=header["skipna"]
+        )
+        n_buffers = 2 * bm._order if bm._compensated else bm._order
+        size = int(np.prod(header["shape"], dtype=int))
+        state = np.frombuffer(buffer, dtype=bm._dtype, count=n_buffers * size)
+        if not state.flags.writeable:
+            state = state.copy()
+        bm._n = header["n"]
+        if bm._n is None:  # the counts of the elements follow the state
+            bm._n = np.frombuffer(buffer, dtype="<f8", count=size, offset=state.nbytes).astype(np.float64).reshape(header["shape"])
+        bm._moments_shape = tuple(header["shape"])
+        bm._bind_state(state.reshape(n_buffers, *bm._moments_shape))
+        bm._initialized = True
+        return bm
+
+    def _prefix(self) -> bytes:
+        """The magic, the size of the header, the header and padding, such that the state is aligned."""
+        header = self._header()
+        if isinstance(self._n, np.ndarray):
+            header["n"] = None
+        header = json.dumps(header).encode("utf-8")
+        prefix = self._FORMAT_MAGIC + struct.pack("<I", len(header)) + header
+        return prefix + b"\0" * (-len(prefix) % self._FORMAT_ALIGNMENT)
+
+    @staticmethod
+    def _parse_prefix(prefix: bytes) -> tuple:
+        """Parses magic and header.
+
+        Returns: tuple of header and size of the prefix
+        """
+        if bytes(prefix[:4]) != BatchedMoments._FORMAT_MAGIC:
+            raise RuntimeError("Not a serialized BatchedMoments state.")
+        size = 8 + struct.unpack("<I", bytes(prefix[4:8]))[0]
+        header = json.loads(bytes(prefix[8:size]).decode("utf-8"))
+        return header, size + (-size % BatchedMoments._FORMAT_ALIGNMENT)
+
+    def _counts_bytes(self) -> bytes:
+        """The counts of the elements, if they are an array."""
+        return self._n.astype("<f8").tobytes() if isinstance(self._n, np.ndarray) else b""
+
+    def to_bytes(self) -> bytes:
+        """Serializes the state into a compact binary format: a small header followed by the contiguous moments."""
+        if not self._initialized:
+            raise RuntimeError("Object not initialized!")
+        self._sync()
+        return self._prefix() + self._state.tobytes() + self._counts_bytes()
+
+    @staticmethod
+    def from_bytes(buffer) -> "BatchedMoments":
+        """Deserializes a state created by `to_bytes`.
+        Writeable buffers (e.g. `bytearray`) are used without copying the moments.
+        """
+        view = memoryview(buffer).cast("B")
+        header, offset = BatchedMoments._parse_prefix(view)
+        return BatchedMoments._from_header(header, view[offset:])
+
+    def save(self, path: Union[str, os.PathLike]):
+        """Saves the state to a file, in the format of `to_bytes`."""
+        if not self._initialized:
+            raise RuntimeError("Object not initialized!")
+        self._sync()
+        with open(path, "wb") as f:
+            f.write(self._prefix())
+            f.write(np.ascontiguousarray(self._state).data)
+            f.write(self._counts_bytes())
+
+    @staticmethod
+    def load(path: Union[str, os.PathLike], mmap_mode: Union[str, None] = "c") -> "BatchedMoments":
+        """Loads a state saved with `save`.
+
+        Args:
+            path: path of the file
+            mmap_mode: If not None, the moments are memory-mapped with the given mode (see `np.memmap`),
+                    the default "c" (copy-on-write) never modifies the file. Otherwise, the moments are read.
+
+        Returns:
+            the loaded moments
+        """
+        with open(path, "rb") as f:
+            prefix = f.read(8)
+            header, offset = BatchedMoments._parse_prefix(prefix + f.read(struct.unpack("<I", prefix[4:8])[0]))
+            if mmap_mode is None:
+                f.seek(offset)
+                return BatchedMoments._from_header(header, bytearray(f.read()))
+        return BatchedMoments._from_header(header, np.memmap(path, dtype=np.uint8, mode=mmap_mode, offset=offset))
+
+    def __reduce_ex__(self, protocol):
+        """With pickle protocol 5 the moments are pickled as (out-of-band) buffer."""
+        # the binary format contains the moments only, not the extrema, quantiles, workspace and instrumentation
+        extras = self._extrema or self._sketch is not None or self._workspace is not None or self._stats is not None
+        if protocol < 5 or self.__class__ is not BatchedMoments or not self._initialized or extras:
+            return super().__reduce_ex__(protocol)
+        return BatchedMoments._from_header, (self._header(), pickle.PickleBuffer(self._state))
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the views of the moments are restored from the state buffer
+        for name in self._MOMENTS + ("_compensation",):
+            state.pop(name, None)
+        state["_cache"] = {}
+        # the buffers of the workspace are not worth transferring
+        if self._workspace is not None:
+            state["_workspace"] = Workspace()
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._bind_state(self._state)
+
+    @property
+    def stats(self) -> Union[UpdateStats, None]:
+        """Counters and per-phase timings of the updates, if instrumented (see `UpdateStats`)."""
+        return self._stats
+
+    @property
+    def ddof(self) -> int:
+        return self._ddof
+
+    @property
+    def order(self) -> int:
+        return self._order
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    def _check_order(self, order: int, statistic: str):
+        if self._order < order:
+            raise RuntimeError(f"The {statistic} requires moments of order {order}, but only order {self._order} is tracked.")
+
+    @property
+    def shape(self) -> tuple:
+        return self._moments_shape
+
+    def _cached(self, statistic: str, compute) -> Union[np.ndarray, None]:
+        """Returns a copy of the cached statistic, which is computed if the state changed since.
+        The cached arrays are read-only, thus callers can't modify the cache."""
+        if not self._initialized:
+            return None
+        value = self._cache.get(statistic)
+        if value is None:
+            value = compute()
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._cache[statistic] = value
+        return value.copy() if isinstance(value, np.ndarray) else value
+
+    def _statistics(self) -> list:
+        """The tracked statistics, i.e. mean, variance, skewness, kurtosis and the standardized moments of higher order."""
+        names = ("mean", "variance", "skewness", "kurtosis")
+        return [getattr(self, names[p - 1]) if p <= len(names) else self.standardized_moment(p) for p in range(1, self._order + 1)]
+
+    def summary(self) -> Union[np.ndarray, None]:
+        """The tracked statistics, i.e. mean, variance, skewness, kurtosis and the standardized moments
+        of higher order (up to `order`), stacked to an array of shape `(order, *shape)`."""
+        return self._cached("summary", lambda: np.stack(self._statistics()))
+
+    def central_moment(self, p: int) -> Union[np.ndarray, None]:
+        """The p-th central moment `1/n sum_{i=1}^n (x_i - mean)**p`."""
+        self._check_order(p, f"central moment of order {p}")
+        if p < 2:
+            return self._cached("central_moment_1", lambda: np.zeros_like(self._m1))
+        return self._cached(f"central_moment_{p}", lambda: self._moments[p - 1] / self._n)
+
+    def standardized_moment(self, p: int) -> Union[np.ndarray, None]:
+        """The p-th standardized moment, i.e. the p-th central moment divided by `std**p` (with zero ddof).
+        E.g. the third standardized moment is the skewness, and the fourth is the kurtosis (not the excess kurtosis)."""
+        self._check_order(max(p, 2), f"standardized moment of order {p}")
+        return self._cached(
+            f"standardized_moment_{p}", lambda: self.central_moment(p) / pow(self.central_moment(2), p / 2)
+        )
+
+    @property
+    def mean(self) -> Union[np.ndarray, None]:
+        if isinstance(self._n, np.ndarray) and not np.all(self._n > 0):
+            # elements without any valid element have no mean
+            return self._cached("mean", lambda: np.where(self._n > 0, self._m1, np.nan))
+        return self._cached("mean", lambda: self._m1[...])
+
+    @property
+    def variance(self) -> Union[np.ndarray, None]:
+        self._check_order(2, "variance")
+        return self._cached("variance", lambda: self._m2 / (self._n - self._ddof))
+
+    @property
+    def std(self) -> Union[np.ndarray, None]:
+        return self._cached("std", lambda: np.sqrt(self.variance))
+
+    @property
+    def skewness(self) -> Union[np.ndarray, None]:
+        """Skewness is a measure of the asymmetry of a distribution (or data set).
+         The skewness value can be positive, zero, negative, or undefined.
+
+        References:
+            Joanes, D. N., and C. A. Gill. "Comparing measures of sample skewness and kurtosis."
+             Journal of the Royal Statistical Society: Series D (The Statistician) 47.1 (1998): 183-189.
+             https://doi.org/10.1111/1467-9884.00122
+
+        Returns:
+            the sample skewness
+        """
+        self._check_order(3, "skewness")
+        return self._cached("skewness", lambda: np.sqrt(1.0 * self._n) * self._m3 / pow(self._m2, 1.5))
+
+    @property
+    def kurtosis(self) -> Union[np.ndarray, None]:
+        """Kurtosis is a measure of the "tailedness" of a distribution (or data set)
+         relative to a normal distribution.
+
+        References:
+            Joanes, D. N., and C. A. Gill. "Comparing measures of sample skewness and kurtosis."
+             Journal of the Royal Statistical Society: Series D (The Statistician) 47.1 (1998): 183-189.
+             https://doi.org/10.1111/1467-9884.00122
+
+        Returns:
+            the sample kurtosis
+        """
+        self._check_order(4, "kurtosis")
+        return self._cached("kurtosis", lambda: 1.0 * self._n * self._m4 / (self._m2 * self._m2) - 3.0)
+
+    @property
+    def minimum(self) -> Union[np.ndarray, None]:
+        if not self._extrema:
+            raise RuntimeError("The minimum is not tracked, see `extrema`.")
+        return self._cached("minimum", partial(np.copy, self._min))
+
+    @property
+    def maximum(self) -> Union[np.ndarray, None]:
+        if not self._extrema:
+            raise RuntimeError("The maximum is not tracked, see `extrema`.")
+        return self._cached("maximum", partial(np.copy, self._max))
+
+    def quantile(self, q: Union[float, np.ndarray]) -> Union[np.ndarray, None]:
+        """The approximate q-th quantile(s), of shape `(*q.shape, *shape)`, see `QuantileSketch`."""
+        if self._quantiles is None:
+            raise RuntimeError("The quantiles are not tracked, see `quantiles`.")
+        return self._sketch.quantile(q) if self._sketch is not None else None
+
+    @property
+    def median(self) -> Union[np.ndarray, None]:
+        return self.quantile(0.5)
+
+    def __repr__(self) -> str:
+        if self._order < 2:
+            return f"<BatchedMoments ({self._n}): {str(self.mean)}>"
+        return f"<BatchedMoments ({self._n}): {str(self.mean)} ± {str(self.std)}>"
@@ -0,0 +1,100 @@
+from itertools import chain
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable
+import numpy as np
+
+
+def _worker(accumulator, names: list, tasks, free, results):
+    """Updates a local accumulator with the batches in the shared memory slots, until a `None` task is received.
+
+    Each processed slot is handed back via `free`, the accumulator (or the first error) is sent via `results`.
+    """
+    # the workers share the resource tracker of the parent process, which owns (and unlinks) the blocks
+    slots = [SharedMemory(name) for name in names]
+    error = None
+    for slot, shape, dtype in iter(tasks.get, None):
+        if error is None:
+            try:
+                accumulator.update(np.ndarray(shape, dtype=dtype, buffer=slots[slot].buf))
+            except Exception as e:  # pylint: disable=broad-except
+                error = e
+        free.put(slot)
+    for shm in slots:
+        shm.close()
+    results.put(accumulator if error is None else error)
+
+
+def _feed(bm, batches: Iterable, slots: list, tasks, free):
+    """Copies the (chunks of the) batches into free slots and queues them as tasks."""
+    slot_bytes = slots[0].size
+    for batch in batches:
+        for chunk in bm._chunks(np.asarray(batch), slot_bytes):
+            if chunk.nbytes > slot_bytes:
+                bm.update(chunk)
+                continue
+            slot = free.get()
+            np.copyto(np.ndarray(chunk.shape, dtype=chunk.dtype, buffer=slots[slot].buf), chunk)
+            tasks.put((slot, chunk.shape, chunk.dtype.str))
+
+
+def _prepare(bm, first: np.ndarray):
+    """Initializes `bm` with the first batch, and checks that the accumulators of the workers can be merged into it."""
+    if not bm._initialized:
+        bm._initialize(first.shape)
+    # the accumulators of the workers are created by `from_`
+    if type(bm.from_(bm)) is not type(bm):
+        raise RuntimeError(f"{type(bm).__name__} can't be computed by multiple processes.")
+
+
+def _parallel_update(bm, source: Iterable, processes: int) -> list:
+    """Updates local copies of `bm` with the batches of `source` in `processes` worker processes.
+
+    The batches are copied into shared memory slots of the size of the first batch,
+    larger batches are split into chunks along the first reduced axis, chunks which still don't fit are
+    used to update `bm` directly.
+
+    Returns: list of the accumulators of the workers
+    """
+    source = iter(source)
+    first = next(source, None)
+    if first is None:
+        return []
+    first = np.asarray(first)
+    _prepare(bm, first)
+    slot_bytes = max(first.nbytes, 1)
+    ctx = get_context()
+    tasks, free, results = ctx.Queue(), ctx.Queue(), ctx.Queue()
+    # two slots per worker, such that the next batch is copied while the previous one is processed
+    slots = [SharedMemory(create=True, size=slot_bytes) for _ in range(2 * processes)]
+    workers = [
+        ctx.Process(
+            target=_worker,
+            args=(bm.from_(bm), [shm.name for shm in slots], tasks, free, results),
+            daemon=True
+        )
+        for _ in range(processes)
+    ]
+    try:
+        for worker in workers:
+            worker.start()
+        for slot in range(len(slots)):
+            free.put(slot)
+        _feed(bm, chain([first], source), slots, tasks, free)
+        for _ in workers:
+            tasks.put(None)
+        accumulators = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for shm in slots:
+            shm.close()
+            shm.unlink()
+    for accumulator in accumulators:
+        if isinstance(accumulator, Exception):
+            raise RuntimeError("Update failed in a worker process.") from accumulator
+    # workers which got no batch return empty accumulators
+    return [accumulator for accumulator in accumulators if len(accumulator) > 0]
@@ -0,0 +1,132 @@
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import AsyncIterable, Iterable
+import numpy as np
+
+# marks the end of the batches in the queue
+_END = object()
+
+
+def _put(batches: Queue, item: tuple, stop: Event) -> bool:
+    """Puts the item into the queue, unless the consumer stopped before there was space."""
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=0.1)
+            return True
+        except Full:
+            continue
+    return False
+
+
+def _load(source: Iterable, batches: Queue, stop: Event):
+    """Puts the batches of `source` (and errors) into the queue, followed by the end marker."""
+    try:
+        for batch in source:
+            if not _put(batches, (batch, None), stop):
+                return
+    except Exception as e:  # pylint: disable=broad-except
+        _put(batches, (None, e), stop)
+        return
+    _put(batches, (_END, None), stop)
+
+
+def _batches(batches: Queue) -> Iterable:
+    """Yields the batches of the queue, until the end marker is received."""
+    while True:
+        batch, error = batches.get()
+        if error is not None:
+            raise RuntimeError("Loading a batch failed.") from error
+        if batch is _END:
+            return
+        yield batch
+
+
+def _partial(bm, batch):
+    """Computes the moments of the batch into a new accumulator with the options of `bm`."""
+    partial = bm.from_(bm)
+    if type(partial) is not type(bm):
+        raise RuntimeError(f"{type(bm).__name__} can't be computed by multiple workers.")
+    return partial(batch)
+
+
+def _prepare(bm, batch):
+    """Initializes `bm` with the first batch, which is needed to create partial accumulators."""
+    if not bm._initialized:
+        bm._initialize(np.shape(batch))
+
+
+def _merge_done(bm, pending: deque, ordered: bool) -> deque:
+    """Merges the oldest (or any completed) partial accumulators into `bm`, returns the remaining ones."""
+    if ordered:
+        bm += pending.popleft().result()
+        return pending
+    done, remaining = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        bm += future.result()
+    return deque(remaining)
+
+
+def _consume(bm, source: Iterable, prefetch: int, workers: int, ordered: bool):
+    """Updates `bm` with the batches of `source`, which are loaded by a background thread into a bounded queue.
+
+    With multiple workers, partial accumulators of the batches are computed by a pool of threads
+    (numpy releases the GIL), and merged into `bm` by the calling thread.
+    """
+    batches, stop = Queue(max(1, prefetch)), Event()
+    Thread(target=_load, args=(source, batches, stop), daemon=True).start()
+    try:
+        if workers < 2:
+            for batch in _batches(batches):
+                bm(batch)
+            return bm
+        with ThreadPoolExecutor(workers) as pool:
+            pending: deque = deque()
+            for batch in _batches(batches):
+                _prepare(bm, batch)
+                pending.append(pool.submit(_partial, bm, batch))
+                if len(pending) >= workers:
+                    pending = _merge_done(bm, pending, ordered)
+            while pending:
+                pending = _merge_done(bm, pending, True)
+        return bm
+    finally:
+        stop.set()
+
+
+async def _amerge_done(bm, pending: deque, ordered: bool) -> deque:
+    """Like `_merge_done`, for the futures of an event loop. Futures of direct updates have no result."""
+    if ordered:
+        done = [pending.popleft()]
+        await done[0]
+    else:
+        done, remaining = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        pending = deque(remaining)
+    for future in done:
+        if future.result() is not bm:
+            bm += future.result()
+    return pending
+
+
+async def _aconsume(bm, source: AsyncIterable, prefetch: int, workers: int, ordered: bool):
+    """Updates `bm` with the batches of an asynchronous iterable.
+
+    The batches are computed by a pool of threads, while the event loop loads the next batches.
+    At most `prefetch` batches wait for a worker. A single worker updates `bm` directly.
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        pending: deque = deque()
+        async for batch in source:
+            if workers < 2:
+                pending.append(loop.run_in_executor(pool, bm, batch))
+            else:
+                _prepare(bm, batch)
+                pending.append(loop.run_in_executor(pool, _partial, bm, batch))
+            if len(pending) >= max(1, workers) + max(0, prefetch):
+                pending = await _amerge_done(bm, pending, ordered or workers < 2)
+        while pending:
+            pending = await _amerge_done(bm, pending, True)
+    return bm
@@ -0,0 +1,60 @@
+from typing import Iterable
+import numpy as np
+
+from .instrumentation import UpdateStats
+
+
+def _group_moments(bm, group: list) -> tuple:
+    """Computes the moments of a group of arrays of equal shape at once.
+
+    Arrays are stacked along a new first axis, which is reduced with the reduced axes of `bm`,
+    a single array is used without copying.
+
+    Returns: tuple of element count and moments
+    """
+    t = group[0] if len(group) == 1 else np.stack(group)
+    axis = bm.axis if bm.axis is not None else tuple(range(group[0].ndim))
+    if len(group) > 1:
+        axis = (0,) + tuple(ax + 1 for ax in axis)
+    valid = bm._valid(t, None)
+    kwargs = {"axis": axis, "order": bm.order, "dtype": bm.dtype}
+    with bm._phase("compute"):
+        if valid is not None:
+            n, *moments = bm._compute_masked_moments(t, valid, **kwargs)
+        else:
+            n, *moments = bm._compute_moments(t, **kwargs)
+    if bm._stats is not None:
+        bm._stats.count(t, UpdateStats.temporaries(t, bm.order, bm.dtype, False, valid is not None))
+    return n, tuple(moments)
+
+
+def _ragged_blocks(bm, arrays: Iterable, group_elements: int) -> Iterable:
+    """Yields the element count and moments of the arrays, which differ along the reduced axes of `bm` only.
+
+    Arrays of fewer than `group_elements` elements are grouped by shape (and dtype), a group is computed
+    once it holds `group_elements` elements. Larger arrays are computed one by one.
+    """
+    groups: dict = {}
+    for t in arrays:
+        t = np.asarray(t)
+        if t.ndim == 0:  # the kernels compute in place, which requires arrays
+            t = t.reshape(1)
+        if not bm._initialized:
+            bm._initialize(t.shape)
+        axis = bm.axis if bm.axis is not None else tuple(range(t.ndim))
+        if tuple(d for ax, d in enumerate(t.shape) if ax not in axis) != bm.shape or t.ndim <= max(axis, default=-1):
+            raise RuntimeError("Arrays must differ along the reduced axes only.")
+        if t.size == 0:
+            continue
+        if bm._extrema or bm._sketch is not None:
+            bm._update_extras(t, None, bm._valid(t, None))
+        if t.size >= group_elements:
+            yield _group_moments(bm, [t])
+            continue
+        key = (t.shape, t.dtype.str)
+        group = groups.setdefault(key, [])
+        group.append(t)
+        if len(group) * t.size >= group_elements:
+            yield _group_moments(bm, groups.pop(key))
+    for group in groups.values():
+        yield _group_moments(bm, group)
@@ -0,0 +1,113 @@
+from typing import Union
+import numpy as np
+
+
+class QuantileSketch:
+    """Mergeable sketch of the quantiles of each element of the moments.
+
+    Values are collected in levels of at most `capacity` items, where an item of level `l` represents `2**l` values.
+    A full level is compacted: its items are sorted and every other item is promoted to the next level
+    (like the compactors of the KLL sketch, with alternating offsets instead of random ones).
+    All elements see the same number of values, thus the levels of all elements are stored as stacked arrays
+    of shape `(items, *shape)` and compacted at once.
+    The rank error is about `log2(n / capacity) / capacity`.
+
+    References:
+        Karnin, Zohar, Kevin Lang, and Edo Liberty. "Optimal quantile approximation in streams."
+         2016 IEEE 57th Annual Symposium on Foundations of Computer Science (FOCS). IEEE, 2016.
+    """
+
+    def __init__(self, capacity: int, shape: tuple, dtype: np.dtype = np.float64):
+        """
+        Args:
+            capacity: Number of items per level and element, larger capacities are more accurate.
+            shape: Shape of the elements, i.e. of the moments.
+            dtype: Type of the items.
+        """
+        if capacity < 2:
+            raise ValueError(f"Capacity must be at least 2, got {capacity}.")
+        self._capacity = capacity
+        self._shape = tuple(shape)
+        self._dtype = np.dtype(dtype)
+        self._levels: list = []
+        # number of compactions of each level, which alternates the offset of the promoted items
+        self._compactions: list = []
+        self._n: int = 0
+
+    def _compact(self):
+        """Compacts all levels which exceed the capacity, starting with the lowest level."""
+        for level, items in enumerate(self._levels):
+            if len(items) <= self._capacity:
+                continue
+            # an odd item stays in its level
+            n_compacted = len(items) - len(items) % 2
+            compacted = np.sort(items[:n_compacted], axis=0)[self._compactions[level] % 2::2]
+            self._compactions[level] += 1
+            self._levels[level] = items[n_compacted:]
+            if level + 1 == len(self._levels):
+                self._levels.append(compacted)
+                self._compactions.append(0)
+            else:
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], compacted])
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        """Adds the values of shape `(n, *shape)`, i.e. `n` values of each element."""
+        values = np.asarray(values, dtype=self._dtype).reshape((-1,) + self._shape)
+        self._n += len(values)
+        # large batches are added in pieces of the capacity, thus the sorted temporaries stay small
+        for start in range(0, len(values), self._capacity):
+            if not self._levels:
+                self._levels.append(np.empty((0,) + self._shape, dtype=self._dtype))
+                self._compactions.append(0)
+            self._levels[0] = np.concatenate([self._levels[0], values[start:start + self._capacity]])
+            self._compact()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Merges the items of `other` into `self`."""
+        if self._shape != other._shape:
+            raise RuntimeError("Won't broadcast shapes. You are on your own, sorry.")
+        for level, items in enumerate(other._levels):
+            if level == len(self._levels):
+                self._levels.append(items.astype(self._dtype))
+                self._compactions.append(other._compactions[level])
+            else:
+                self._levels[level] = np.concatenate([self._levels[level], items.astype(self._dtype)])
+        self._n += other._n
+        self._compact()
+        return self
+
+    def reduce(self, axis: tuple) -> "QuantileSketch":
+        """Returns a new sketch, where the items of all elements along `axis` are merged."""
+        shape = tuple(d for _i, d in enumerate(self._shape) if _i not in axis)
+        reduced = QuantileSketch(self._capacity, shape, self._dtype)
+        for items in self._levels:
+            # the reduced axes are moved next to the axis of the items
+            moved = np.moveaxis(items, tuple(ax + 1 for ax in axis), tuple(range(1, len(axis) + 1)))
+            reduced._levels.append(moved.reshape((-1,) + shape))
+            reduced._compactions.append(0)
+        reduced._n = self._n * int(np.prod([self._shape[ax] for ax in axis], dtype=int))
+        reduced._compact()
+        return reduced
+
+    def quantile(self, q: Union[float, np.ndarray]) -> Union[np.ndarray, None]:
+        """The approximate q-th quantile(s) of each element, of shape `(*q.shape, *shape)`."""
+        if self._n == 0:
+            return None
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** _i) for _i, level in enumerate(self._levels)])
+        order = np.argsort(items, axis=0)
+        ranks = np.cumsum(weights[order], axis=0)
+        q = np.asarray(q, dtype=np.float64)
+        # the first item (in sorted order) whose cumulative weight reaches the rank of the quantile
+        indices = np.stack([np.sum(ranks < _q * ranks[-1], axis=0) for _q in q.ravel()])
+        np.minimum(indices, len(items) - 1, out=indices)
+        quantiles = np.take_along_axis(items, np.take_along_axis(order, indices, axis=0), axis=0)
+        return quantiles.reshape(q.shape + self._shape)
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
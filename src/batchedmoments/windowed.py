@@ -0,0 +1,136 @@
+# pylint: disable=unsubscriptable-object
+from collections import deque
+from typing import Union
+import numpy as np
+
+from .moments import BatchedMoments
+
+
+class WindowedMoments(BatchedMoments):
+    """Computes sample statistics of the last `window` batches, e.g. for drift detection on a stream.
+
+    The moments of each batch in the window are kept, thus the batch which leaves the window is removed from the
+    moments by inverting the merge (see `_split_moments`). Each update costs O(size of the moments),
+    independent of the size of the window.
+    """
+
+    # each batch is a single step of the stream
+    _SPLIT_BATCHES = False
+
+    def __init__(
+            self,
+            window: int,
+            axis: Union[tuple, int] = None,
+            shape: tuple = None,
+            ddof: int = 0,
+            *,
+            order: int = 4,
+            dtype: np.dtype = np.float64,
+            compensated: bool = False,
+            n_threads: Union[int, None] = 1,
+            skipna: bool = False
+    ):
+        """
+        Args:
+            window: Number of (most recent) batches the statistics are computed of.
+            axis: Axis to be reduced. If None, a scalar value is computed (default)
+            shape: Shape of the moments. If None, first update will initialize and set shape.
+            ddof: "Delta Degrees of Freedom": the divisor used in the calculation is
+                    ``N - ddof``, where ``N`` represents the number of elements. (default is zero)
+
+        For the remaining options see `BatchedMoments`.
+        """
+        if window < 1:
+            raise ValueError(f"Window must contain at least one batch, got {window}.")
+        self._window = window
+        self._batches: deque = deque()
+        super().__init__(
+            axis, shape, ddof, order=order, dtype=dtype, compensated=compensated, n_threads=n_threads, skipna=skipna
+        )
+
+    def _initialize(self, shape: Union[tuple, None]) -> bool:
+        self._batches = deque()
+        return super()._initialize(shape)
+
+    def update(
+            self,
+            t: np.ndarray,
+            weights: Union[np.ndarray, None] = None,
+            mask: Union[np.ndarray, None] = None
+    ) -> "WindowedMoments":
+        batch = BatchedMoments.from_(self).update(t, weights=weights, mask=mask)
+        self._add_increments(self._merge_increments(self._n, self._moments, batch._n, batch._moments))
+        self._n = self._n + batch._n
+        self._batches.append(batch)
+        if len(self._batches) > self._window:
+            expired = self._batches.popleft()
+            remaining = self._split_moments(self._n, self._moments, expired._n, expired._moments)
+            self._add_increments(tuple(a - m for a, m in zip(remaining, self._moments)))
+            self._n = self._n - expired._n
+        return self
+
+    def __iadd__(self, other: BatchedMoments) -> "WindowedMoments":
+        raise RuntimeError("Can't add moments to a window, update the window with batches instead.")
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+
+class DecayingMoments(BatchedMoments):
+    """Computes exponentially weighted sample statistics, e.g. for drift detection on a stream.
+
+    Before each batch is merged, the accumulated element count and central sums are multiplied by `decay`,
+    i.e. a batch seen `k` batches ago has the weight `decay**k`. Each update costs O(size of the moments).
+    """
+
+    # each batch is a single step of the stream
+    _SPLIT_BATCHES = False
+
+    def __init__(
+            self,
+            decay: float,
+            axis: Union[tuple, int] = None,
+            shape: tuple = None,
+            ddof: int = 0,
+            *,
+            order: int = 4,
+            dtype: np.dtype = np.float64,
+            compensated: bool = False,
+            n_threads: Union[int, None] = 1,
+            skipna: bool = False
+    ):
+        """
+        Args:
+            decay: Factor in (0, 1] the accumulated moments are multiplied by before each batch.
+            axis: Axis to be reduced. If None, a scalar value is computed (default)
+            shape: Shape of the moments. If None, first update will initialize and set shape.
+            ddof: "Delta Degrees of Freedom": the divisor used in the calculation is
+                    ``N - ddof``, where ``N`` represents the number of elements. (default is zero)
+
+        For the remaining options see `BatchedMoments`.
+        """
+        if not 0.0 < decay <= 1.0:
+            raise ValueError(f"Decay must be in (0, 1], got {decay}.")
+        self._decay = decay
+        super().__init__(
+            axis, shape, ddof, order=order, dtype=dtype, compensated=compensated, n_threads=n_threads, skipna=skipna
+        )
+
+    def update(
+            self,
+            t: np.ndarray,
+            weights: Union[np.ndarray, None] = None,
+            mask: Union[np.ndarray, None] = None
+    ) -> "DecayingMoments":
+        # the mean is unaffected, the central sums scale with the weights
+        self._cache.clear()
+        self._n = self._n * self._decay
+        self._state[1:self._order] *= self._decay
+        if self._compensated:
+            self._state[self._order + 1:] *= self._decay
+        return super().update(t, weights=weights, mask=mask)
+
+    @property
+    def decay(self) -> float:
+        return self._decay
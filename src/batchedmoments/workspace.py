@@ -0,0 +1,125 @@
+from typing import Iterable, Union
+import numpy as np
+
+from .kernels import binomial
+
+
+class Workspace:
+    """Scratch buffers of the updates, allocated once for each shape and dtype of the batches.
+
+    The moments of a batch are computed into the buffers, and merged into the accumulated moments in place,
+    thus once the buffers of a batch shape exist, an update doesn't allocate arrays.
+    """
+
+    # buffers of at most as many batch shapes are kept
+    _MAX_SHAPES = 8
+
+    def __init__(self):
+        self._buffers: dict = {}
+        # total size of all buffers allocated so far
+        self.allocated_bytes: int = 0
+
+    def _get(self, t: np.ndarray, axis: Union[tuple, None], order: int, dtype: np.dtype, shape: tuple) -> dict:
+        """The buffers for batches of the shape and dtype of `t`."""
+        key = (t.shape, t.dtype.str, order, np.dtype(dtype).str)
+        buffers = self._buffers.get(key)
+        if buffers is None:
+            if len(self._buffers) >= self._MAX_SHAPES:
+                self._buffers.clear()
+            reduced = axis if axis is not None else tuple(range(t.ndim))
+            buffers = self._buffers[key] = {
+                "mean": np.empty(tuple(1 if ax in reduced else d for ax, d in enumerate(t.shape)), dtype=dtype),
+                "d": np.empty(t.shape, dtype=dtype),
+                "power": np.empty(t.shape, dtype=dtype) if order > 1 else None,
+                "moments": np.empty((order, *shape), dtype=dtype),
+            }
+            self.allocated_bytes += sum(b.nbytes for b in buffers.values() if b is not None)
+        return buffers
+
+    def compute_moments(self, t: np.ndarray, axis: Union[tuple, None], order: int, dtype: np.dtype, shape: tuple) -> tuple:
+        """Computes the moments of the batch into the buffers, see `kernels.compute_moments`.
+
+        Returns: tuple of element count and moments (views of the buffers)
+        """
+        buffers = self._get(t, axis, order, dtype, shape)
+        n = int(np.prod([t.shape[x] for x in axis] if axis is not None else t.shape, dtype=int))
+        mean, d, power = buffers["mean"], buffers["d"], buffers["power"]
+        # views of the buffer, which are arrays even for scalar moments
+        moments = tuple(buffers["moments"][_i, ...] for _i in range(order))
+        np.mean(t, axis=axis, dtype=dtype, keepdims=True, out=mean)
+        moments[0][...] = mean.reshape(shape)
+        if order > 1:
+            np.subtract(t, mean, out=d)
+            np.multiply(d, d, out=power)
+            np.sum(power, axis=axis, out=moments[1])
+        for p in range(3, order + 1):
+            np.multiply(power, d, out=power)
+            np.sum(power, axis=axis, out=moments[p - 1])
+        return (n, *moments)
+
+    def merge(self, n_a, a: tuple, n_b, b: tuple):
+        """Merges the moments `b` of `n_b` elements into the moments `a` of `n_a` elements in place,
+        see `kernels.merge_increments`.
+
+        The higher moments are merged first, as their increments depend on the lower moments of `a`.
+        """
+        n = n_a + n_b
+        if n == 0:  # merging moments of no elements keeps the (zero) moments
+            return
+        scratch = self._get_scratch(a[0])
+        delta, power, term, tmp = (scratch[_i, ...] for _i in range(4))
+        np.subtract(b[0], a[0], out=delta)
+        for p in range(len(a), 1, -1):
+            np.add(a[p - 1], b[p - 1], out=a[p - 1])
+            np.copyto(power, delta)
+            for k in range(1, p - 1):
+                np.multiply(a[p - k - 1], binomial(p, k) * (-n_b / n) ** k, out=term)
+                np.multiply(b[p - k - 1], binomial(p, k) * (n_a / n) ** k, out=tmp)
+                term += tmp
+                term *= power
+                np.add(a[p - 1], term, out=a[p - 1])
+                power *= delta
+            # delta^p
+            np.multiply(power, delta, out=term)
+            term *= n_a * n_b / n * ((n_a / n) ** (p - 1) - (-n_b / n) ** (p - 1))
+            np.add(a[p - 1], term, out=a[p - 1])
+        np.multiply(delta, n_b / n, out=term)
+        np.add(a[0], term, out=a[0])
+
+    def _get_scratch(self, m: np.ndarray) -> np.ndarray:
+        """Scratch buffers of the shape and dtype of the moments."""
+        key = (m.shape, m.dtype.str)
+        scratch = self._buffers.get(key)
+        if scratch is None:
+            scratch = self._buffers[key] = np.empty((4, *m.shape), dtype=m.dtype)
+            self.allocated_bytes += scratch.nbytes
+        return scratch
+
+    def cascade(self, blocks: Iterable) -> tuple:
+        """Merges the pairs of element count and moments like a balanced binary tree, in place.
+
+        Partial results of equal numbers of blocks are merged as soon as they exist (like the carries of a binary
+        counter), thus at most O(log N) partial results are kept and each block is copied at most once.
+
+        Returns: tuple of element count and moments
+        """
+        # partial results: number of merged blocks, element count, moments and whether the moments are copies
+        stack = []
+        for n, moments in blocks:
+            size, owned = 1, False
+            while stack and stack[-1][0] == size:
+                n, moments, size = self._merge_partial(stack.pop(), n, moments) + (2 * size,)
+                owned = True
+            stack.append((size, n, moments, owned))
+        _, n, moments, _ = stack.pop()
+        while stack:
+            n, moments = self._merge_partial(stack.pop(), n, moments)
+        return n, moments
+
+    def _merge_partial(self, partial: tuple, n_b, b: tuple) -> tuple:
+        """Merges the moments `b` into (a copy of) the moments of the partial result."""
+        _, n_a, a, owned = partial
+        if not owned:
+            a = tuple(np.array(m) for m in a)
+        self.merge(n_a, a, n_b, b)
+        return n_a + n_b, a
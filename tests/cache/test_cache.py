@@ -0,0 +1,55 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments
+
+
+def test_cache_invalidation():
+    rng = np.random.default_rng(19)
+    data = rng.random((100, 3))
+    bm = BatchedMoments(axis=0)(data[:50])
+    variance = bm.variance
+    assert bm._cache["variance"] is not variance
+    # the returned statistics are writable copies, e.g. for normalization
+    std = bm.std
+    std[0] = 0.0
+    variance[0] = 0.0
+    assert np.allclose(bm.variance, data[:50].var(axis=0))
+    assert np.allclose(bm.std, data[:50].std(axis=0))
+    bm(data[50:])
+    assert np.allclose(bm.variance, data.var(axis=0))
+    _ = bm.kurtosis
+    bm += BatchedMoments(axis=0)(data)
+    assert "kurtosis" not in bm._cache
+    bm._initialize(data.shape)
+    assert not bm._cache
+
+
+def test_summary():
+    rng = np.random.default_rng(19)
+    data = rng.random((100, 3))
+    bm = BatchedMoments(axis=0, order=2)(data)
+    summary = bm.summary()
+    assert summary.shape == (2, 3)
+    assert np.allclose(summary, [data.mean(axis=0), data.var(axis=0)])
+    cached = bm._cache["summary"]
+    assert np.array_equal(bm.summary(), summary)
+    assert bm._cache["summary"] is cached
+    assert BatchedMoments(order=2).summary() is None
+
+
+def test_eq_identical():
+    data = np.arange(12.0).reshape(4, 3)
+    bm = BatchedMoments(axis=0)(data)
+    assert bm == BatchedMoments(axis=0)(data)
+    assert not bm._cache
+
+
+def test_statistics_writable():
+    data = np.arange(12.0).reshape(4, 3)
+    for mask in (None, np.zeros(data.shape, dtype=bool)):
+        bm = BatchedMoments(axis=0)(data, mask=mask)
+        mean, std = bm.mean, bm.std
+        mean[0] = -1.0
+        std[std > 0] = 1.0
+        assert np.array_equal(bm.mean, data.mean(axis=0))
+        assert np.allclose(bm.std, data.std(axis=0))
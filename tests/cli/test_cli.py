@@ -0,0 +1,58 @@
+import json
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments
+from batchedmoments import cli
+
+
+@pytest.fixture(name="shards")
+def fixture_shards(tmp_path):
+    rng = np.random.default_rng(25)
+    data = [rng.random((n, 3, 4, 4)) for n in (5, 7, 2, 9, 4)]
+    for _i, x in enumerate(data):
+        np.save(tmp_path / f"shard-{_i}.npy", x)
+    return tmp_path, np.concatenate(data)
+
+
+def test_cli(shards):
+    directory, data = shards
+    expected = BatchedMoments(axis=(0, 2, 3))(data)
+    output = directory / "stats.json"
+    assert cli.main([str(directory / "*.npy"), "--axis", "0", "2", "3", "--processes", "2", "--output", str(output)]) == 0
+    stats = json.loads(output.read_text())
+    assert stats["n"] == len(expected)
+    assert np.allclose(stats["mean"], expected.mean)
+    assert np.allclose(stats["kurtosis"], expected.kurtosis)
+    np.savez(directory / "shards.npz", a=data[:10], b=data[10:])
+    assert cli.main([str(directory / "*.npz"), "--axis", "0", "2", "3", "--order", "2", "--output", str(directory / "s.npz")]) == 0
+    with np.load(directory / "s.npz") as stats:
+        assert np.allclose(stats["std"], expected.std)
+        assert "skewness" not in stats.files
+    assert cli.main([str(directory / "*.none")]) == 1
+
+
+def test_cli_resume(shards, monkeypatch):
+    directory, data = shards
+    args = [str(directory / "*.npy"), "--axis", "0", "2", "3", "--processes", "1", "--output", str(directory / "stats.json"),
+            "--checkpoint", str(directory / "checkpoint"), "--checkpoint-every", "2"]
+    scan, scanned = cli._scan, []
+
+    def interrupted(path, **kwargs):
+        if len(scanned) == 3:
+            raise KeyboardInterrupt
+        scanned.append(path)
+        return scan(path, **kwargs)
+
+    monkeypatch.setattr(cli, "_scan", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        cli.main(args)
+    assert len(json.loads((directory / "checkpoint" / "progress.json").read_text())["shards"]) == 2
+    scanned.clear()
+    monkeypatch.setattr(cli, "_scan", lambda path, **kwargs: scanned.append(path) or scan(path, **kwargs))
+    assert cli.main(args) == 0
+    assert len(scanned) == 3
+    assert np.allclose(json.loads((directory / "stats.json").read_text())["variance"], data.var(axis=(0, 2, 3)))
+    assert len(list((directory / "checkpoint").glob("state-*"))) == 1
+    with pytest.raises(RuntimeError):
+        cli.main(args[:2] + ["1"] + args[5:])
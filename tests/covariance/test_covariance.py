@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments, BatchedCovariance
+
+
+def test_covariance():
+    rng = np.random.default_rng(11)
+    data = rng.random((500, 4)) @ rng.random((4, 4)) + 100.0
+    bc = BatchedCovariance(axis=0, ddof=1)
+    for batch in np.array_split(data, 7):
+        bc(batch)
+    assert np.allclose(bc.covariance, np.cov(data, rowvar=False))
+    assert np.allclose(bc.correlation, np.corrcoef(data, rowvar=False))
+    assert np.allclose(bc.variance, np.diagonal(bc.covariance))
+    assert BatchedMoments.__eq__(bc, BatchedMoments(axis=0, ddof=1, order=2)(data))
+
+
+def test_covariance_axes():
+    rng = np.random.default_rng(11)
+    data = rng.random((10, 3, 8, 8))
+    bc = BatchedCovariance(axis=(0, 2, 3))(data)
+    features = np.moveaxis(data, 1, 0).reshape(3, -1)
+    assert bc.covariance.shape == (3, 3)
+    assert np.allclose(bc.covariance, np.cov(features, bias=True))
+
+
+def test_covariance_add():
+    rng = np.random.default_rng(11)
+    data = rng.random((300, 5))
+    bcs = [BatchedCovariance(axis=0)(batch) for batch in np.array_split(data, 3)]
+    bc = BatchedCovariance(axis=0)
+    for dbc in bcs:
+        bc += dbc
+    assert bc == BatchedCovariance(axis=0)(data)
+    assert bcs[0] + bcs[1] + bcs[2] == bc
+    with pytest.raises(RuntimeError):
+        bc += BatchedMoments(axis=0)(data)
+    high = BatchedCovariance(axis=0, order=4)(data)
+    comoment = high.comoment.copy()
+    with pytest.raises(RuntimeError):
+        high += BatchedCovariance(axis=0)(data)
+    assert np.array_equal(high.comoment, comoment)
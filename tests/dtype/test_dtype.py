@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments
+
+
+def test_dtype_float32():
+    data = np.random.default_rng(3).random((100, 4)).astype(np.float32)
+    bm = BatchedMoments(axis=0, dtype=np.float32)(data[:50])
+    bm += BatchedMoments(axis=0, dtype=np.float32)(data[50:])
+    assert all(m.dtype == np.float32 for m in bm._moments)
+    assert bm.reduce().dtype == np.float32
+    assert np.allclose(np.mean(data, axis=0), bm.mean)
+    reference = BatchedMoments(axis=0)(data)
+    for stat in ("variance", "skewness", "kurtosis"):
+        assert np.allclose(getattr(reference, stat), getattr(bm, stat), rtol=1e-4, atol=1e-5)
+
+
+def test_compensated():
+    rng = np.random.default_rng(3)
+    batches = [(1e3 + rng.standard_normal((4, 8))).astype(np.float32) for _ in range(1000)]
+    reference = BatchedMoments(axis=0)
+    plain = BatchedMoments(axis=0, dtype=np.float32)
+    compensated = BatchedMoments(axis=0, dtype=np.float32, compensated=True)
+    for batch in batches:
+        reference(batch)
+        plain(batch)
+        compensated(batch)
+    error_plain = np.abs(plain.mean - reference.mean).max()
+    error_compensated = np.abs(compensated.mean - reference.mean).max()
+    assert error_compensated < error_plain
+
+
+def test_dtype_invalid():
+    with pytest.raises(ValueError):
+        BatchedMoments(dtype=np.int32)
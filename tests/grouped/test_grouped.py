@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments, GroupedBatchedMoments
+
+
+def test_grouped():
+    rng = np.random.default_rng(3)
+    data = rng.random((200, 3, 4, 4))
+    ids = rng.integers(0, 5, size=200)
+    grouped = GroupedBatchedMoments(5, axis=(0, 2, 3))
+    for st in range(0, 200, 50):
+        grouped(data[st: st + 50], ids[st: st + 50])
+    assert grouped.mean.shape == (5, 3)
+    for g in range(5):
+        bm = BatchedMoments(axis=(0, 2, 3))(data[ids == g])
+        assert grouped[g] == bm
+        assert np.allclose(grouped.kurtosis[g], bm.kurtosis)
+
+
+def test_grouped_add():
+    rng = np.random.default_rng(3)
+    data = rng.random(100)
+    ids = rng.integers(0, 8, size=100)
+    full = GroupedBatchedMoments(8)(data, ids)
+    added = GroupedBatchedMoments(8)
+    added += GroupedBatchedMoments(8)(data[:50], ids[:50])
+    added += GroupedBatchedMoments(8)(data[50:], ids[50:])
+    assert np.array_equal(full.counts, added.counts)
+    assert np.allclose(full.variance, added.variance)
+    assert np.allclose(full.skewness, added.skewness)
+
+
+def test_grouped_invalid():
+    with pytest.raises(ValueError):
+        GroupedBatchedMoments(2, axis=1)
+    with pytest.raises(RuntimeError):
+        GroupedBatchedMoments(2)(np.zeros(4), [0, 1])
+    for group_ids in ([0, 0, -1, 1], [0, 2, 1, 1]):
+        with pytest.raises(RuntimeError):
+            GroupedBatchedMoments(2)(np.zeros(4), group_ids)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments, HistogramMoments
+
+
+def test_histogram():
+    data = np.random.default_rng(3).integers(0, 256, size=(32, 3, 8, 8), dtype=np.uint8)
+    hm = HistogramMoments(axis=(0, 2, 3))
+    for st in range(0, 32, 8):
+        hm(data[st: st + 8])
+    bm = BatchedMoments(axis=(0, 2, 3))(data)
+    assert len(hm) == len(bm)
+    assert hm.counts.shape == (3, 256)
+    assert bm == hm
+
+
+def test_histogram_signed():
+    data = np.random.default_rng(3).integers(-1000, 1000, size=(64, 5), dtype=np.int16)
+    hm = HistogramMoments(axis=0, value_dtype=np.int16)(data)
+    assert BatchedMoments(axis=0)(data) == hm
+
+
+def test_histogram_add():
+    data = np.random.default_rng(3).integers(0, 256, size=(100, 2), dtype=np.uint8)
+    full = HistogramMoments(axis=0)(data)
+    added = HistogramMoments(axis=0)(data[:50]) + HistogramMoments(axis=0)(data[50:])
+    assert isinstance(added, HistogramMoments)
+    assert np.array_equal(full.counts, added.counts)
+    assert full == added
+    bm = BatchedMoments(axis=0)(data[:50])
+    bm += HistogramMoments(axis=0)(data[50:])
+    assert bm == BatchedMoments(axis=0)(data)
+    with pytest.raises(RuntimeError):
+        added += BatchedMoments(axis=0)(data)
+
+
+def test_histogram_invalid():
+    with pytest.raises(RuntimeError):
+        HistogramMoments()(np.array([0.5, 1.5]))
+    with pytest.raises(RuntimeError):
+        HistogramMoments()([1, 300])
+    with pytest.raises(ValueError):
+        HistogramMoments(value_dtype=np.int32)
@@ -0,0 +1,72 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments, WindowedMoments
+from batchedmoments.ingest import _as_array
+
+
+class Producer:
+    """A DLPack producer, like a CPU tensor."""
+
+    def __init__(self, a):
+        self.a = a
+
+    def __dlpack__(self, **kwargs):
+        return self.a.__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return self.a.__dlpack_device__()
+
+
+class Chunked:
+    """A chunked array container, like a dask or zarr array, which records the reads."""
+
+    def __init__(self, a, chunk_length):
+        self.a = a
+        self.shape, self.ndim, self.dtype, self.nbytes = a.shape, a.ndim, a.dtype, a.nbytes
+        self.chunks = (chunk_length,) + a.shape[1:]
+        self.reads = []
+
+    def __getitem__(self, index):
+        self.reads.append(index[0])
+        return self.a[index].copy()
+
+    def __array__(self, dtype=None, copy=None):
+        return self.a.copy()
+
+
+def test_dlpack():
+    data = np.random.default_rng(23).random((3, 100)).T
+    assert np.shares_memory(_as_array(Producer(data)), data)
+    bm = BatchedMoments(axis=0, stats=True)(Producer(data))
+    assert bm.stats.converted_bytes == 0
+    assert bm == BatchedMoments(axis=0)(data)
+
+
+def test_buffer_protocol():
+    data = np.random.default_rng(23).random(100)
+    buffer = bytearray(data.tobytes())
+    assert np.shares_memory(_as_array(memoryview(buffer).cast("d")), np.frombuffer(buffer))
+    assert BatchedMoments()(memoryview(buffer).cast("d")) == BatchedMoments()(data)
+
+
+def test_chunked():
+    data = np.random.default_rng(23).random((100, 3, 8))
+    chunked = Chunked(data, 6)
+    bm = BatchedMoments(axis=(0, 2))
+    bm._CHUNK_BYTES = data.nbytes // 5
+    bm(chunked)
+    assert len(chunked.reads) > 1
+    assert all(r.start % 6 == 0 and (r.stop - r.start) % 6 == 0 for r in chunked.reads)
+    assert bm == BatchedMoments(axis=(0, 2))(data)
+    window = WindowedMoments(1, axis=(0, 2))(Chunked(data, 6))
+    assert window == bm
+
+
+def test_memmap_weights_mask(tmp_path):
+    data = np.random.default_rng(23).random((20, 3))
+    mm = np.memmap(tmp_path / "data.bin", dtype=data.dtype, mode="w+", shape=data.shape)
+    mm[:] = data
+    weights = np.arange(20.0)[:, None]
+    assert BatchedMoments(axis=0)(mm, weights=weights) == BatchedMoments(axis=0)(data, weights=weights)
+    mask = data > 0.8
+    assert BatchedMoments(axis=0)(mm, mask=mask) == BatchedMoments(axis=0)(data, mask=mask)
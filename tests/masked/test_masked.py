@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from scipy.stats import kurtosis, skew
+
+from batchedmoments import BatchedMoments
+
+
+def _data():
+    rng = np.random.default_rng(3)
+    data = rng.random((40, 3))
+    data[rng.random(data.shape) < 0.2] = np.nan
+    data[:, 2] = np.nan  # fully masked column
+    data[5, 1] = np.nan
+    return data
+
+
+@pytest.mark.filterwarnings("ignore:invalid value")
+def test_skipna():
+    data = _data()
+    bm = BatchedMoments(axis=0, skipna=True)
+    for st in range(0, 40, 10):
+        bm(data[st: st + 10])
+    assert np.array_equal(bm._n, np.sum(~np.isnan(data), axis=0))
+    assert np.allclose(np.nanmean(data[:, :2], axis=0), bm.mean[:2])
+    assert np.allclose(np.nanvar(data[:, :2], axis=0), bm.variance[:2])
+    assert np.allclose(skew(data[:, :2], axis=0, nan_policy="omit"), bm.skewness[:2])
+    assert np.allclose(kurtosis(data[:, :2], axis=0, nan_policy="omit"), bm.kurtosis[:2])
+    assert np.isnan(bm.mean[2]) and bm._n[2] == 0
+
+
+@pytest.mark.filterwarnings("ignore:invalid value")
+def test_mask():
+    data = _data()
+    mask = np.isnan(data)
+    masked = BatchedMoments(axis=0)(np.ma.masked_invalid(data))
+    assert masked == BatchedMoments(axis=0)(np.nan_to_num(data), mask=mask)
+    assert masked == BatchedMoments(axis=0, skipna=True)(data)
+    added = BatchedMoments(axis=0)(data[:20], mask=mask[:20]) + BatchedMoments(axis=0)(data[20:], mask=mask[20:])
+    assert masked == added
+
+
+def test_mask_reduce():
+    data = _data()
+    bm = BatchedMoments(axis=0, skipna=True)(data[:, :2].reshape(10, 4, 2))
+    reduced = bm.reduce()
+    assert len(reduced) == np.sum(~np.isnan(data[:, :2]))
+    assert np.isclose(np.nanmean(data[:, :2]), reduced.mean)
+    assert np.isclose(np.nanvar(data[:, :2]), reduced.variance)
+
+
+@pytest.mark.filterwarnings("ignore:invalid value")
+def test_mask_serialization():
+    bm = BatchedMoments(axis=0, skipna=True, dtype=np.float32)(_data())
+    loaded = BatchedMoments.from_bytes(bm.to_bytes())
+    assert np.array_equal(bm._n, loaded._n)
+    assert loaded == bm
+
+
+@pytest.mark.filterwarnings("ignore:invalid value")
+def test_mask_empty():
+    data = np.arange(12, dtype=np.float64).reshape(4, 3)
+    mask = np.zeros(data.shape, dtype=bool)
+    mask[:, 1] = True
+    bm = BatchedMoments(axis=0)(data, mask=mask)
+    assert np.isnan(bm.mean[1])
+    assert np.isnan(bm.variance[1])
+    assert np.allclose(bm.mean[[0, 2]], data[:, [0, 2]].mean(axis=0))
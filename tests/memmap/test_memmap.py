@@ -0,0 +1,28 @@
+import tracemalloc
+
+import numpy as np
+
+from batchedmoments import BatchedMoments, HistogramMoments
+
+
+def test_from_file(tmp_path):
+    data = np.random.default_rng(3).random((64, 3, 16, 16))
+    np.save(tmp_path / "data.npy", data)
+    chunk_bytes = data.nbytes // 16
+    tracemalloc.start()
+    bm = BatchedMoments.from_file(tmp_path / "data.npy", axis=(0, 2, 3), chunk_bytes=chunk_bytes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < data.nbytes // 2
+    assert bm == BatchedMoments(axis=(0, 2, 3))(data)
+
+
+def test_update_memmap(tmp_path):
+    data = np.random.default_rng(3).integers(0, 256, size=(32, 8, 3), dtype=np.uint8)
+    mm = np.memmap(tmp_path / "data.bin", dtype=data.dtype, mode="w+", shape=data.shape)
+    mm[:] = data
+    bm = BatchedMoments(axis=(1, 2)).update_memmap(mm, chunk_bytes=100, prefetch=False)
+    assert bm == BatchedMoments(axis=(1, 2))(data)
+    hm = HistogramMoments(axis=(1, 2)).update_memmap(mm, chunk_bytes=100)
+    assert isinstance(hm, HistogramMoments)
+    assert bm == hm
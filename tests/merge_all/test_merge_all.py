@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments
+
+
+def test_merge_all():
+    rng = np.random.default_rng(5)
+    data = rng.random((1000, 3, 4))
+    states = [BatchedMoments(axis=0)(batch) for batch in np.array_split(data, 37)]
+    merged = BatchedMoments.merge_all(states, block_size=4)
+    assert len(merged) == 1000
+    assert merged == BatchedMoments(axis=0)(data)
+
+
+def test_merge_all_cascade(monkeypatch):
+    # large moments are merged pairwise in place
+    monkeypatch.setattr(BatchedMoments, "_MIN_BLOCK_SIZE", 1 << 30)
+    rng = np.random.default_rng(5)
+    data = rng.random((1000, 3, 4))
+    states = [BatchedMoments(axis=0, order=3)(batch) for batch in np.array_split(data, 37)]
+    merged = BatchedMoments.merge_all(states)
+    assert len(merged) == 1000
+    assert merged == BatchedMoments(axis=0, order=3)(data)
+    assert states[0] == BatchedMoments(axis=0, order=3)(np.array_split(data, 37)[0])
+    empty = [BatchedMoments(axis=0, shape=(3, 4), order=3) for _ in range(2)]
+    merged = BatchedMoments.merge_all(empty + states + empty)
+    assert len(merged) == 1000
+    assert merged == BatchedMoments(axis=0, order=3)(data)
+    assert len(BatchedMoments.merge_all(empty)) == 0
+
+
+def test_merge_all_masked():
+    rng = np.random.default_rng(5)
+    data = rng.random((100, 3))
+    mask = rng.random((100, 3)) < 0.3
+    states = [BatchedMoments(axis=0)(data[:50], mask=mask[:50]), BatchedMoments(axis=0)(data[50:])]
+    merged = BatchedMoments.merge_all(states + [BatchedMoments(axis=0)])
+    expected = BatchedMoments(axis=0)(data, mask=np.concatenate([mask[:50], np.zeros((50, 3), dtype=bool)]))
+    assert np.array_equal(merged._n, expected._n)
+    assert merged == expected
+
+
+def test_merge_all_errors():
+    with pytest.raises(RuntimeError):
+        BatchedMoments.merge_all([BatchedMoments()])
+    with pytest.raises(RuntimeError):
+        BatchedMoments.merge_all([BatchedMoments(axis=0)(np.ones((2, 3))), BatchedMoments(axis=0)(np.ones((2, 4)))])
+    for block_size in (0, 1):
+        with pytest.raises(ValueError):
+            BatchedMoments.merge_all([BatchedMoments()(np.ones(3))] * 3, block_size=block_size)
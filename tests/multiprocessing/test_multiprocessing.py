@@ -1,8 +1,10 @@
 import multiprocessing
 from multiprocessing import Pool
 from itertools import tee
+import numpy as np
+import pytest
 
-from batchedmoments import BatchedMoments
+from batchedmoments import BatchedMoments, HistogramMoments, WindowedMoments
 
 
 def test_multiprocessing_add():
@@ -19,3 +21,26 @@ def test_multiprocessing_add():
     for batch in data:
         seq += BatchedMoments()(batch)
     assert seq == bm
+
+
+def test_parallel_update():
+    rng = np.random.default_rng(13)
+    batches = [rng.random((20, 3, 4)) for _ in range(10)]
+    # the last batch is larger than the shared memory slots
+    batches.append(rng.random((50, 3, 4)))
+    bm = BatchedMoments(axis=0)(batches[0])
+    bm.parallel_update(batches[1:], processes=2)
+    assert len(bm) == 250
+    assert bm == BatchedMoments(axis=0)(np.concatenate(batches))
+    # more processes than batches, with moments large enough to be merged in place
+    batch = rng.random((2, 3, 512, 512))
+    bm = BatchedMoments(axis=0, order=1).parallel_update([batch], processes=3)
+    assert len(bm) == 2
+    assert np.allclose(bm.mean, batch.mean(axis=0))
+
+
+def test_parallel_update_subclasses():
+    batches = [np.zeros((4, 3), dtype=np.uint8)] * 2
+    for bm in (HistogramMoments(axis=0), WindowedMoments(2, axis=0)):
+        with pytest.raises(RuntimeError):
+            bm.parallel_update(iter(batches), processes=2)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from scipy.stats import moment
+
+from batchedmoments import BatchedMoments, GroupedBatchedMoments, WindowedMoments
+
+
+def test_order_values():
+    data = np.random.default_rng(3).random((100, 4))
+    full = BatchedMoments(axis=0)(data)
+    for order in range(1, 5):
+        bm = BatchedMoments(axis=0, order=order)(data[:50])
+        bm += BatchedMoments(axis=0, order=order)(data[50:])
+        assert len(bm._moments) == order
+        assert np.allclose(full.mean, bm.mean)
+        if order > 1:
+            assert np.allclose(full.variance, bm.variance)
+
+
+def test_order_untracked():
+    bm = BatchedMoments(order=2)(list(range(100)))
+    assert bm._m3 is None and bm._m4 is None
+    with pytest.raises(RuntimeError):
+        _ = bm.skewness
+    with pytest.raises(RuntimeError):
+        _ = bm.kurtosis
+
+
+def test_order_add():
+    data = list(range(100))
+    full = BatchedMoments()(data)
+    mean_var = BatchedMoments(order=2)
+    mean_var += full
+    assert mean_var == BatchedMoments(order=2)(data)
+    with pytest.raises(RuntimeError):
+        full += mean_var
+
+
+def test_order_reduce():
+    data = [list(range(100))] * 10
+    assert BatchedMoments(order=2)(data) == BatchedMoments(axis=1, order=2)(data).reduce(0)
+
+
+def test_order_invalid():
+    with pytest.raises(ValueError):
+        BatchedMoments(order=0)
+
+
+@pytest.mark.parametrize("workspace", [False, True])
+def test_order_high(workspace):
+    data = np.random.default_rng(3).standard_normal((200, 4)) + 5.0
+    bm = BatchedMoments(axis=0, order=6, workspace=workspace)
+    for batch in np.array_split(data, 7):
+        bm(batch)
+    merged = BatchedMoments(axis=0, order=6)(data[:50])
+    merged += BatchedMoments(axis=0, order=6)(data[50:])
+    for p in range(1, 7):
+        assert np.allclose(bm.central_moment(p), moment(data, p, axis=0))
+        assert np.allclose(merged.central_moment(p), moment(data, p, axis=0))
+    assert np.allclose(bm.standardized_moment(3), bm.skewness)
+    assert np.allclose(bm.standardized_moment(4), bm.kurtosis + 3.0)
+    assert bm.summary().shape == (6, 4)
+    assert bm == merged
+
+
+def test_order_high_reduce():
+    data = np.random.default_rng(3).standard_normal((20, 10, 3))
+    reduced = BatchedMoments(axis=0, order=5)(data).reduce(0)
+    assert np.allclose(reduced.central_moment(5), moment(data.reshape(-1, 3), 5, axis=0))
+    merged = BatchedMoments.merge_all([BatchedMoments(axis=0, order=5)(batch) for batch in data])
+    assert np.allclose(merged.central_moment(5), moment(data.reshape(-1, 3), 5, axis=0))
+
+
+def test_order_high_window():
+    batches = np.random.default_rng(3).random((6, 50, 2))
+    wm = WindowedMoments(2, axis=0, order=6)
+    for batch in batches:
+        wm(batch)
+    assert np.allclose(wm.central_moment(6), moment(batches[-2:].reshape(-1, 2), 6, axis=0))
+
+
+def test_order_high_grouped():
+    data = np.random.default_rng(3).random((100, 2))
+    ids = np.arange(100) % 3
+    gbm = GroupedBatchedMoments(3, axis=0, order=5)(data, ids)
+    assert np.allclose(gbm[1].central_moment(5), moment(data[ids == 1], 5, axis=0))
@@ -0,0 +1,46 @@
+import asyncio
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments, HistogramMoments
+
+
+def batches(n=20, seed=24):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        yield rng.normal(size=(64, 3))
+
+
+def test_consume():
+    expected = BatchedMoments(axis=0)
+    for batch in batches():
+        expected(batch)
+    assert BatchedMoments(axis=0).consume(batches()) == expected
+    assert BatchedMoments(axis=0).consume(batches(), prefetch=4, workers=3) == expected
+    unordered = BatchedMoments(axis=0, extrema=True).consume(batches(), workers=2, ordered=False)
+    assert unordered == expected
+    assert len(unordered) == len(expected)
+    assert np.array_equal(unordered.maximum, np.max(list(batches()), axis=(0, 1)))
+
+
+def test_consume_errors():
+    def failing():
+        yield np.zeros((4, 3))
+        raise ValueError("broken loader")
+
+    with pytest.raises(RuntimeError) as error:
+        BatchedMoments(axis=0).consume(failing())
+    assert isinstance(error.value.__cause__, ValueError)
+    with pytest.raises(RuntimeError):
+        HistogramMoments(axis=0).consume((np.zeros((4, 3), dtype=np.uint8) for _ in range(4)), workers=2)
+
+
+def test_aconsume():
+    async def source():
+        for batch in batches():
+            await asyncio.sleep(0)
+            yield batch
+
+    expected = BatchedMoments(axis=0).consume(batches())
+    assert asyncio.run(BatchedMoments(axis=0).aconsume(source())) == expected
+    assert asyncio.run(BatchedMoments(axis=0).aconsume(source(), prefetch=1, workers=3, ordered=False)) == expected
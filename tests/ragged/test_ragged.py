@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments, BatchedCovariance, HistogramMoments, WindowedMoments
+
+
+def test_update_ragged():
+    rng = np.random.default_rng(22)
+    images = [rng.random((1, 3, h, w)) for h, w in rng.integers(4, 40, size=(50, 2))]
+    images += [rng.random((2, 3, 300, 200))] + images[:10]
+    bm = BatchedMoments(axis=(0, 2, 3)).update_ragged(images)
+    data = np.concatenate([x.transpose(1, 0, 2, 3).reshape(3, -1) for x in images], axis=1)
+    assert len(bm) == data.shape[1]
+    assert np.allclose(bm.mean, data.mean(axis=1))
+    assert np.allclose(bm.variance, data.var(axis=1))
+    assert np.allclose(bm.kurtosis, BatchedMoments(axis=1)(data).kurtosis)
+    expected = BatchedMoments(axis=(0, 2, 3))
+    for image in images:
+        expected(image)
+    assert bm == expected
+
+
+def test_update_ragged_skipna():
+    rng = np.random.default_rng(22)
+    arrays = [rng.random((n, 4)) for n in rng.integers(1, 20, size=30)]
+    arrays[3][0, 1] = np.nan
+    bm = BatchedMoments(axis=0, skipna=True, extrema=True).update_ragged(iter(arrays), block_size=4)
+    data = np.concatenate(arrays)
+    assert np.allclose(bm.mean, np.nanmean(data, axis=0))
+    assert np.allclose(bm.variance, np.nanvar(data, axis=0))
+    assert np.array_equal(bm.maximum, np.nanmax(data, axis=0))
+
+
+def test_update_ragged_shapes():
+    bm = BatchedMoments(axis=0)
+    with pytest.raises(RuntimeError):
+        bm.update_ragged([np.zeros((2, 3)), np.zeros((2, 4))])
+
+
+def test_update_ragged_subclasses():
+    rng = np.random.default_rng(22)
+    arrays = [rng.integers(0, 256, size=(n, 3), dtype=np.uint8) for n in (3, 8, 5)]
+    data = np.concatenate(arrays)
+    hm = HistogramMoments(axis=0).update_ragged(arrays)
+    assert np.allclose(hm.mean, data.mean(axis=0))
+    assert np.allclose(hm.variance, data.var(axis=0))
+    window = WindowedMoments(1, axis=0).update_ragged([x + 100.0 for x in arrays] + [rng.normal(size=(50, 3))])
+    assert len(window) == 50
+    assert np.all(np.abs(window.mean) < 1.0)
+    cov = BatchedCovariance(axis=0).update_ragged([x.astype(np.float64) for x in arrays])
+    assert np.allclose(cov.covariance, np.cov(data.T, bias=True))
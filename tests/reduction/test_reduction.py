@@ -1,3 +1,5 @@
+import numpy as np
+
 from batchedmoments import BatchedMoments
 
 
@@ -6,3 +8,18 @@ def test_batches():
     full = BatchedMoments()(data)
     reduced = BatchedMoments(axis=1)(data).reduce(0)
     assert full == reduced
+
+
+def test_reduce_axes():
+    data = np.random.default_rng(3).random((16, 3, 8, 8))
+    full = BatchedMoments(axis=(0, 2, 3))(data)
+    reduced = BatchedMoments(axis=0)(data).reduce((1, 2))
+    assert reduced.axis == full.axis
+    assert reduced.shape == full.shape
+    assert len(reduced) == len(full)
+    assert full == reduced
+
+
+def test_reduce_all():
+    data = np.random.default_rng(3).random((16, 3, 8))
+    assert BatchedMoments()(data) == BatchedMoments(axis=0)(data).reduce()
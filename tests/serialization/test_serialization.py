@@ -0,0 +1,54 @@
+import pickle
+
+import numpy as np
+
+from batchedmoments import BatchedMoments, HistogramMoments
+
+
+def _moments(shape=(16, 3, 4)):
+    return BatchedMoments(axis=0, order=3, dtype=np.float32)(np.random.default_rng(3).random(shape))
+
+
+def test_bytes():
+    bm = _moments()
+    buffer = bm.to_bytes()
+    assert len(buffer) <= 4 * 3 * 3 * 4 + 2 * BatchedMoments._FORMAT_ALIGNMENT + 256
+    loaded = BatchedMoments.from_bytes(buffer)
+    assert loaded == bm
+    assert len(loaded) == len(bm)
+    loaded(np.ones((2, 3, 4)))  # read-only buffers are copied
+    # writeable buffers are used without copying
+    buffer = bytearray(buffer)
+    loaded = BatchedMoments.from_bytes(buffer)
+    assert np.shares_memory(loaded._state, np.frombuffer(buffer, dtype=np.uint8))
+
+
+def test_pickle_out_of_band():
+    bm = BatchedMoments(axis=0, compensated=True)(np.random.default_rng(3).random((16, 8)))
+    buffers = []
+    data = pickle.dumps(bm, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+    assert len(data) < bm._state.nbytes
+    loaded = pickle.loads(data, buffers=buffers)
+    assert loaded == bm
+    assert all(np.shares_memory(m, loaded._state) for m in loaded._moments + loaded._compensation)
+
+
+def test_pickle_views():
+    bm = _moments()
+    for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+        loaded = pickle.loads(pickle.dumps(bm, protocol=protocol))
+        assert np.shares_memory(loaded._m1, loaded._state)
+        assert loaded == bm
+    hm = HistogramMoments(axis=0)(np.arange(10, dtype=np.uint8).reshape(5, 2))
+    assert pickle.loads(pickle.dumps(hm, protocol=5)) == hm
+
+
+def test_save_load(tmp_path):
+    bm = _moments()
+    bm.save(tmp_path / "state.bm")
+    for mmap_mode in ("c", None):
+        loaded = BatchedMoments.load(tmp_path / "state.bm", mmap_mode=mmap_mode)
+        assert loaded == bm
+        loaded(np.ones((2, 3, 4)))
+        assert BatchedMoments.load(tmp_path / "state.bm") == bm
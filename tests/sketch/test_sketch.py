@@ -0,0 +1,68 @@
+import pickle
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments, QuantileSketch
+
+
+def test_extrema():
+    rng = np.random.default_rng(21)
+    data = rng.normal(size=(1000, 3))
+    bm = BatchedMoments(axis=0, extrema=True)
+    for batch in np.array_split(data, 7):
+        bm(batch)
+    assert np.array_equal(bm.minimum, data.min(axis=0))
+    assert np.array_equal(bm.maximum, data.max(axis=0))
+    reduced = bm.reduce()
+    assert reduced.minimum == data.min()
+    assert reduced.maximum == data.max()
+    with pytest.raises(RuntimeError):
+        _ = BatchedMoments(axis=0)(data).minimum
+
+
+def test_extrema_masked():
+    data = np.arange(12, dtype=np.float64).reshape(4, 3)
+    data[0, 1] = np.nan
+    bm = BatchedMoments(axis=0, extrema=True, skipna=True)(data)
+    assert np.array_equal(bm.minimum, np.nanmin(data, axis=0))
+    assert np.array_equal(bm.maximum, np.nanmax(data, axis=0))
+
+
+def test_quantiles():
+    rng = np.random.default_rng(21)
+    data = rng.normal(size=(20000, 2))
+    bm = BatchedMoments(axis=0, quantiles=200)
+    for batch in np.array_split(data, 13):
+        bm(batch)
+    q = np.array([0.1, 0.5, 0.9])
+    assert bm.quantile(q).shape == (3, 2)
+    ranks = np.mean(data[None] <= bm.quantile(q)[:, None], axis=1)
+    assert np.allclose(ranks, q[:, None], atol=0.02)
+    assert np.allclose(np.mean(data.ravel() <= bm.reduce().median), 0.5, atol=0.02)
+
+
+def test_quantiles_merge():
+    rng = np.random.default_rng(21)
+    data = rng.exponential(size=(8, 3000))
+    states = [BatchedMoments(quantiles=100, extrema=True)(x) for x in data]
+    for merged in (BatchedMoments.merge_all(states), sum(states[1:], states[0]),
+                   pickle.loads(pickle.dumps(BatchedMoments.merge_all(states), protocol=5))):
+        assert len(merged._sketch) == data.size
+        assert abs(np.mean(data <= merged.quantile(0.25)) - 0.25) < 0.03
+        assert merged.maximum == data.max()
+    with pytest.raises(RuntimeError):
+        states[0] += BatchedMoments()(data[0])
+    with pytest.raises(RuntimeError):
+        states[0](data[0], mask=data[0] > 1.0)
+    with pytest.raises(ValueError):
+        BatchedMoments(skipna=True, quantiles=100)
+
+
+def test_sketch_small():
+    sketch = QuantileSketch(16, ())
+    sketch.update(np.arange(10.0))
+    # without compaction, the quantiles are exact
+    assert sketch.quantile(0.0) == 0.0
+    assert sketch.quantile(0.5) == 4.0
+    assert sketch.quantile(1.0) == 9.0
+    assert QuantileSketch(16, ()).quantile(0.5) is None
@@ -0,0 +1,47 @@
+import pickle
+import numpy as np
+
+from batchedmoments import BatchedMoments
+
+
+def test_stats():
+    data = np.random.default_rng(23).random((10, 4, 8))
+    bm = BatchedMoments(axis=0, stats=True)
+    for batch in data:
+        bm(batch.tolist())
+    bm += BatchedMoments(axis=0)(data[0])
+    stats = bm.stats
+    assert stats.batches == 10
+    assert stats.merges == 1
+    assert stats.elements == data.size
+    assert stats.bytes == stats.converted_bytes == data.nbytes
+    assert stats.temporary_bytes == 2 * data.nbytes
+    assert all(stats.seconds[phase] > 0 for phase in stats.PHASES)
+    assert stats.as_dict()["batches"] == 10
+    stats.reset()
+    assert stats.batches == 0
+
+
+def test_stats_workspace():
+    data = np.random.default_rng(23).random((10, 4, 8))
+    bm = BatchedMoments(axis=0, workspace=True, stats=True)
+    bm(data[0])
+    allocated = bm.stats.temporary_bytes
+    for batch in data[1:]:
+        bm(batch)
+    # the temporaries are allocated for the first batch only
+    assert allocated > 0
+    assert bm.stats.temporary_bytes == allocated
+
+
+def test_stats_disabled():
+    assert BatchedMoments().stats is None
+
+
+def test_stats_pickle():
+    data = np.random.default_rng(19).random((10, 3))
+    bm = BatchedMoments(axis=0, stats=True, workspace=True)(data)
+    restored = pickle.loads(pickle.dumps(bm, protocol=5))
+    assert restored.stats.batches == 1
+    assert restored._workspace is not None
+    assert restored == bm
@@ -0,0 +1,21 @@
+import numpy as np
+
+from batchedmoments import BatchedMoments
+
+
+def test_threads():
+    data = np.random.default_rng(3).random((64, 3, 32, 32))
+    serial = BatchedMoments(axis=(0, 2, 3))(data)
+    threaded = BatchedMoments(axis=(0, 2, 3), n_threads=4)
+    threaded._MIN_CHUNK_SIZE = 1
+    threaded(data)
+    assert len(threaded._batch_moments(data)) == 4
+    assert len(threaded) == len(serial)
+    assert threaded == serial
+
+
+def test_threads_scalar():
+    data = np.random.default_rng(3).random((3, 1000))
+    threaded = BatchedMoments(n_threads=3)
+    threaded._MIN_CHUNK_SIZE = 1
+    assert threaded(data) == BatchedMoments()(data)
@@ -0,0 +1,29 @@
+import numpy as np
+from scipy.stats import kurtosis, skew
+
+from batchedmoments import BatchedMoments
+
+
+def test_update_axis():
+    data = np.random.default_rng(3).random((16, 3, 8, 8)).astype(np.float32)
+    bm = BatchedMoments(axis=(0, 2, 3))(data)
+    flat = data.transpose(1, 0, 2, 3).reshape(3, -1)
+    assert np.allclose(np.mean(flat, axis=1), bm.mean)
+    assert np.allclose(np.var(flat, axis=1), bm.variance)
+    assert np.allclose(skew(flat, axis=1), bm.skewness)
+    assert np.allclose(kurtosis(flat, axis=1), bm.kurtosis)
+
+
+def test_update_input_unchanged():
+    data = np.random.default_rng(3).integers(0, 255, size=(16, 8), dtype=np.uint8)
+    copy = data.copy()
+    BatchedMoments(axis=0)(data)
+    assert np.array_equal(copy, data)
+
+
+def test_update_scalar():
+    bm = BatchedMoments()
+    for x in (1.0, 2.0, np.float32(3.0), np.array(4.0)):
+        bm(x)
+    assert np.isclose(bm.mean, 2.5)
+    assert np.isclose(bm.variance, 1.25)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments
+
+
+def test_weights_repeats():
+    rng = np.random.default_rng(3)
+    data = rng.random((50, 3))
+    repeats = rng.integers(1, 5, size=50)
+    weighted = BatchedMoments(axis=0)(data[:20], weights=repeats[:20, None])
+    weighted(data[20:], weights=repeats[20:, None])
+    assert len(weighted) == repeats.sum()
+    assert weighted == BatchedMoments(axis=0)(np.repeat(data, repeats, axis=0))
+
+
+def test_weights_average():
+    rng = np.random.default_rng(3)
+    data = rng.random((8, 3, 4, 4))
+    weights = rng.random((8, 1, 4, 1))
+    bm = BatchedMoments(axis=(0, 2, 3))(data, weights=weights)
+    w = np.broadcast_to(weights, data.shape)
+    mean = np.average(data, axis=(0, 2, 3), weights=w)
+    variance = np.average((data - mean[:, None, None]) ** 2, axis=(0, 2, 3), weights=w)
+    assert np.allclose(mean, bm.mean)
+    assert np.allclose(variance, bm.variance)
+    assert np.isclose(bm._n, weights.sum() * 4)
+
+
+def test_weights_add():
+    rng = np.random.default_rng(3)
+    data = rng.random(100)
+    weights = rng.random(100)
+    full = BatchedMoments()(data, weights=weights)
+    added = BatchedMoments()(data[:30], weights=weights[:30]) + BatchedMoments()(data[30:], weights=weights[30:])
+    assert full == added
+    threaded = BatchedMoments(n_threads=4)
+    threaded._MIN_CHUNK_SIZE = 1
+    assert full == threaded(data, weights=weights)
+
+
+def test_weights_invalid():
+    data = np.ones((4, 3))
+    with pytest.raises(RuntimeError):
+        BatchedMoments(axis=0)(data, weights=np.ones(3))
+    with pytest.raises(RuntimeError):
+        BatchedMoments(axis=0)(data, weights=np.ones((4, 3)))
+
+
+def test_weights_zero():
+    rng = np.random.default_rng(3)
+    data = rng.random((40, 3))
+    bm = BatchedMoments(axis=0)(np.ones((4, 3)), weights=np.zeros((4, 1)))
+    assert len(bm) == 0
+    bm(data)
+    bm(data[:4], weights=np.zeros((4, 1)))
+    assert bm == BatchedMoments(axis=0)(data)
+    weights = np.ones((40, 1))
+    weights[:20] = 0.0
+    threaded = BatchedMoments(axis=0, n_threads=2)
+    threaded._MIN_CHUNK_SIZE = 1
+    threaded(data, weights=weights)
+    assert threaded == BatchedMoments(axis=0)(data[20:])
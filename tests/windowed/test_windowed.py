@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments, WindowedMoments, DecayingMoments
+
+
+def test_window():
+    rng = np.random.default_rng(7)
+    batches = [rng.random((20, 3)) + _i for _i in range(10)]
+    wm = WindowedMoments(3, axis=0)
+    for _i, batch in enumerate(batches):
+        wm(batch)
+        assert wm == BatchedMoments(axis=0)(np.concatenate(batches[max(0, _i - 2):_i + 1]))
+    assert len(wm) == 60
+
+
+def test_window_masked():
+    rng = np.random.default_rng(7)
+    data = rng.random((4, 20, 3))
+    mask = rng.random((4, 20, 3)) < 0.5
+    wm = WindowedMoments(2, axis=0)
+    for batch, batch_mask in zip(data, mask):
+        wm(batch, mask=batch_mask)
+    expected = BatchedMoments(axis=0)(np.concatenate(data[2:]), mask=np.concatenate(mask[2:]))
+    assert np.array_equal(wm._n, expected._n)
+    assert wm == expected
+
+
+def test_decay():
+    rng = np.random.default_rng(7)
+    batches = rng.random((5, 20, 3))
+    dm = DecayingMoments(0.5, axis=0)
+    for batch in batches:
+        dm(batch)
+    weights = np.repeat(0.5 ** np.arange(4, -1, -1), 20)[:, None]
+    expected = BatchedMoments(axis=0)(batches.reshape(100, 3), weights=weights)
+    assert np.isclose(dm._n, expected._n)
+    assert dm == expected
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        WindowedMoments(0)
+    with pytest.raises(ValueError):
+        DecayingMoments(1.5)
+    with pytest.raises(RuntimeError):
+        WindowedMoments(2, shape=(3,)).__iadd__(BatchedMoments(shape=(3,)))
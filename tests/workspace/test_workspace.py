@@ -0,0 +1,36 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from batchedmoments import BatchedMoments
+
+
+@pytest.mark.parametrize("axis", [None, 0, (0, 2, 3)])
+def test_workspace(axis):
+    rng = np.random.default_rng(17)
+    data = rng.random((6, 8, 3, 5, 5)) + 10.0
+    bm = BatchedMoments(axis=axis, workspace=True)
+    reference = BatchedMoments(axis=axis)
+    for batch in data:
+        bm(batch)
+        reference(batch)
+    assert bm == reference
+
+
+def test_workspace_allocations():
+    rng = np.random.default_rng(17)
+    data = rng.random((4, 64, 3, 32, 32))
+    bm = BatchedMoments(axis=(0, 2, 3), workspace=True)(data[0])
+    bm(data[1])
+    # tracing starts right before the measured updates, thus the peak is theirs
+    tracemalloc.start()
+    try:
+        bm(data[2])
+        bm(data[3])
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # neither the temporaries of the batches nor the moments are allocated again
+    assert current < 1024
+    assert peak < data[2].nbytes / 10